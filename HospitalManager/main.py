@@ -10,17 +10,17 @@ from tkinter import ttk, messagebox
 import os
 import sys
 
-# Add the current directory to Python path for imports
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Application directory, also added to Python path for imports
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(APP_DIR)
 
 from ui.main_window import MainWindow
 from utils.data_manager import DataManager
 
 def create_data_directory():
     """Create data directory if it doesn't exist"""
-    data_dir = os.path.join(os.path.dirname(__file__), 'data')
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
+    data_dir = os.path.join(APP_DIR, 'data')
+    os.makedirs(data_dir, exist_ok=True)
     return data_dir
 
 def main():
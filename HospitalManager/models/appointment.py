@@ -2,18 +2,43 @@
 Appointment Model - Handles appointment data structure and operations
 """
 
-import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import itertools
+import re
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from utils.date_utils import parse_ymd, parse_ymd_hm
+
+# Millisecond-seeded appointment ID sequence
+_id_counter = itertools.count(int(time.time() * 1000))
+
+# Date/time formats accepted by validate
+_DATE_RE = re.compile(r'([0-9]{4})-([0-9]{2})-([0-9]{2})')
+_TIME_RE = re.compile(r'([0-9]{2}):([0-9]{2})')
+
+# Statuses that occupy a doctor's time slot
+BOOKED_STATUSES = frozenset((sys.intern("Scheduled"), sys.intern("Completed")))
 
 class Appointment:
     """Appointment model class for managing appointment information"""
     
+    __slots__ = ('appointment_id', 'patient_id', 'doctor_name', 'department',
+                 '_appointment_date', '_appointment_time', 'status', 'notes',
+                 'created_date', '_dt', '_search_blob')
+    
+    # Fields covered by search_matches; assigning any of them drops the cached search text
+    _SEARCH_FIELDS = frozenset(('appointment_id', 'patient_id', 'doctor_name', 'department',
+                                'appointment_date', 'status'))
+    
     def __init__(self, appointment_id: str = None, patient_id: str = "", 
                  doctor_name: str = "", department: str = "", 
                  appointment_date: str = "", appointment_time: str = "",
                  status: str = "Scheduled", notes: str = ""):
         """Initialize a new appointment instance"""
+        self._dt = None  # Cached appointment datetime, reset when date/time change
+        self._search_blob = None
         self.appointment_id = appointment_id or self.generate_appointment_id()
         self.patient_id = patient_id
         self.doctor_name = doctor_name
@@ -24,11 +49,36 @@ class Appointment:
         self.notes = notes
         self.created_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
+    def __setattr__(self, attr: str, value):
+        """Set an attribute, invalidating the cached search text when needed"""
+        object.__setattr__(self, attr, value)
+        if attr in Appointment._SEARCH_FIELDS:
+            object.__setattr__(self, '_search_blob', None)
+    
     @staticmethod
     def generate_appointment_id() -> str:
         """Generate a unique appointment ID"""
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        return f"A{timestamp}"
+        return f"A{next(_id_counter):014d}"
+    
+    @property
+    def appointment_date(self) -> str:
+        """Appointment date in YYYY-MM-DD format"""
+        return self._appointment_date
+    
+    @appointment_date.setter
+    def appointment_date(self, value: str):
+        self._appointment_date = value
+        self._dt = None
+    
+    @property
+    def appointment_time(self) -> str:
+        """Appointment time in HH:MM format"""
+        return self._appointment_time
+    
+    @appointment_time.setter
+    def appointment_time(self, value: str):
+        self._appointment_time = value
+        self._dt = None
     
     def to_dict(self) -> Dict:
         """Convert appointment object to dictionary"""
@@ -50,16 +100,37 @@ class Appointment:
         appointment = cls(
             appointment_id=data.get('appointment_id'),
             patient_id=data.get('patient_id', ''),
-            doctor_name=data.get('doctor_name', ''),
-            department=data.get('department', ''),
+            doctor_name=sys.intern(data.get('doctor_name', '')),
+            department=sys.intern(data.get('department', '')),
             appointment_date=data.get('appointment_date', ''),
             appointment_time=data.get('appointment_time', ''),
-            status=data.get('status', 'Scheduled'),
+            status=sys.intern(data.get('status', 'Scheduled')),
             notes=data.get('notes', '')
         )
         appointment.created_date = data.get('created_date', appointment.created_date)
         return appointment
     
+    @classmethod
+    def from_dict_fast(cls, data: Dict) -> 'Appointment':
+        """Create appointment object from stored data, skipping constructor defaults (bulk loads)"""
+        if not data.get('appointment_id') or 'created_date' not in data:
+            return cls.from_dict(data)
+        
+        appointment = cls.__new__(cls)
+        set_field = object.__setattr__
+        set_field(appointment, 'appointment_id', data['appointment_id'])
+        set_field(appointment, 'patient_id', data.get('patient_id', ''))
+        set_field(appointment, 'doctor_name', sys.intern(data.get('doctor_name', '')))
+        set_field(appointment, 'department', sys.intern(data.get('department', '')))
+        set_field(appointment, '_appointment_date', data.get('appointment_date', ''))
+        set_field(appointment, '_appointment_time', data.get('appointment_time', ''))
+        set_field(appointment, 'status', sys.intern(data.get('status', 'Scheduled')))
+        set_field(appointment, 'notes', data.get('notes', ''))
+        set_field(appointment, 'created_date', data['created_date'])
+        set_field(appointment, '_dt', None)
+        set_field(appointment, '_search_blob', None)
+        return appointment
+    
     def validate(self) -> tuple[bool, str]:
         """Validate appointment data"""
         if not self.patient_id.strip():
@@ -78,130 +149,197 @@ class Appointment:
             return False, "Appointment time is required"
         
         # Validate date format
-        try:
-            datetime.strptime(self.appointment_date, "%Y-%m-%d")
-        except ValueError:
+        date_match = _DATE_RE.fullmatch(self.appointment_date)
+        if not date_match or not 1 <= int(date_match[2]) <= 12 or not 1 <= int(date_match[3]) <= 31:
             return False, "Invalid date format. Use YYYY-MM-DD"
         
         # Validate time format
+        time_match = _TIME_RE.fullmatch(self.appointment_time)
+        if not time_match or int(time_match[1]) > 23 or int(time_match[2]) > 59:
+            return False, "Invalid time format. Use HH:MM"
+        
+        # Build the datetime from the matched parts (also rejects days past month end)
         try:
-            datetime.strptime(self.appointment_time, "%H:%M")
+            appointment_datetime = datetime(int(date_match[1]), int(date_match[2]), int(date_match[3]),
+                                            int(time_match[1]), int(time_match[2]))
         except ValueError:
-            return False, "Invalid time format. Use HH:MM"
+            return False, "Invalid date format. Use YYYY-MM-DD"
+        self._dt = appointment_datetime
         
         # Check if appointment is in the past
-        appointment_datetime = datetime.strptime(
-            f"{self.appointment_date} {self.appointment_time}", 
-            "%Y-%m-%d %H:%M"
-        )
         if appointment_datetime < datetime.now():
             return False, "Cannot schedule appointment in the past"
         
         return True, ""
     
-    def is_today(self) -> bool:
-        """Check if appointment is scheduled for today"""
-        today = datetime.now().strftime("%Y-%m-%d")
-        return self.appointment_date == today
+    def is_today(self, now: Optional[datetime] = None) -> bool:
+        """Check if appointment is scheduled for today (pass now to share one clock read in loops)"""
+        today = now.date() if now else date.today()
+        try:
+            return parse_ymd(self.appointment_date) == today
+        except ValueError:
+            return False
     
-    def is_upcoming(self) -> bool:
+    def is_upcoming(self, now: Optional[datetime] = None) -> bool:
         """Check if appointment is upcoming"""
-        appointment_datetime = datetime.strptime(
-            f"{self.appointment_date} {self.appointment_time}", 
-            "%Y-%m-%d %H:%M"
-        )
-        return appointment_datetime > datetime.now()
+        return self.get_datetime() > (now or datetime.now())
     
     def get_datetime(self) -> datetime:
         """Get appointment datetime object"""
-        return datetime.strptime(
-            f"{self.appointment_date} {self.appointment_time}", 
-            "%Y-%m-%d %H:%M"
-        )
+        if self._dt is None:
+            self._dt = parse_ymd_hm(self.appointment_date, self.appointment_time)
+        return self._dt
     
-    def time_until_appointment(self) -> str:
+    def time_until_appointment(self, now: Optional[datetime] = None) -> str:
         """Get human-readable time until appointment"""
         appointment_datetime = self.get_datetime()
-        now = datetime.now()
+        now = now or datetime.now()
         
         if appointment_datetime < now:
             return "Past"
         
         diff = appointment_datetime - now
-        days = diff.days
-        hours = diff.seconds // 3600
-        minutes = (diff.seconds % 3600) // 60
+        if diff.days > 0:
+            return f"{diff.days} day(s)"
         
-        if days > 0:
-            return f"{days} day(s)"
-        elif hours > 0:
+        hours, remainder = divmod(diff.seconds, 3600)
+        if hours > 0:
             return f"{hours} hour(s)"
-        else:
-            return f"{minutes} minute(s)"
+        return f"{remainder // 60} minute(s)"
+    
+    def get_search_text(self) -> str:
+        """Get the lowercased text searched by search_matches"""
+        if self._search_blob is None:
+            # Fields are joined with a separator that cannot appear in a query
+            self._search_blob = '\x1f'.join((
+                self.appointment_id, self.patient_id, self.doctor_name,
+                self.department, self.appointment_date, self.status
+            )).lower()
+        return self._search_blob
     
     def search_matches(self, query: str) -> bool:
         """Check if appointment matches search query"""
         query = query.lower().strip()
         if not query:
             return True
-        
-        searchable_fields = [
-            self.appointment_id.lower(),
-            self.patient_id.lower(),
-            self.doctor_name.lower(),
-            self.department.lower(),
-            self.appointment_date,
-            self.status.lower()
-        ]
-        
-        return any(query in field for field in searchable_fields)
+        return query in self.get_search_text()
     
     def __str__(self) -> str:
         """String representation of appointment"""
         return f"Appointment({self.appointment_id}, {self.patient_id}, {self.doctor_name}, {self.appointment_date} {self.appointment_time})"
 
+class AppointmentIndex:
+    """Index of booked appointment times keyed by (doctor_name, appointment_date)"""
+    
+    def __init__(self, appointments: List[Appointment] = None):
+        """Initialize the index, optionally from a list of appointments"""
+        self._booked: Dict[Tuple[str, str], Dict[str, str]] = {}  # (doctor, date) -> {appointment_id: time}
+        self._keys: Dict[str, Tuple[str, str]] = {}  # appointment_id -> (doctor, date)
+        for appointment in appointments or []:
+            self.add(appointment)
+    
+    def add(self, appointment: Appointment):
+        """Add or update an appointment in the index"""
+        self.remove(appointment.appointment_id)
+        if appointment.status in BOOKED_STATUSES:
+            key = (appointment.doctor_name, appointment.appointment_date)
+            self._booked.setdefault(key, {})[appointment.appointment_id] = appointment.appointment_time
+            self._keys[appointment.appointment_id] = key
+    
+    def remove(self, appointment_id: str):
+        """Remove an appointment from the index"""
+        key = self._keys.pop(appointment_id, None)
+        if key is not None:
+            times = self._booked[key]
+            times.pop(appointment_id, None)
+            if not times:
+                del self._booked[key]
+    
+    def get_booked_times(self, doctor_name: str, date: str) -> Set[str]:
+        """Get booked time slots for a doctor on a specific date"""
+        return set(self._booked.get((doctor_name, date), {}).values())
+    
+    def find_booking(self, doctor_name: str, date: str, time: str,
+                     exclude_id: str = None) -> Optional[str]:
+        """Get the ID of an appointment booked in a doctor's slot, ignoring exclude_id"""
+        for appointment_id, booked_time in self._booked.get((doctor_name, date), {}).items():
+            if booked_time == time and appointment_id != exclude_id:
+                return appointment_id
+        return None
+
 class DoctorSchedule:
     """Helper class for managing doctor schedules and availability"""
     
     DEFAULT_DOCTORS = [
-        {"name": "Dr. Smith", "department": "General Medicine", "slots": ["09:00", "10:00", "11:00", "14:00", "15:00", "16:00"]},
-        {"name": "Dr. Johnson", "department": "Cardiology", "slots": ["09:30", "10:30", "11:30", "14:30", "15:30"]},
-        {"name": "Dr. Williams", "department": "Pediatrics", "slots": ["08:00", "09:00", "10:00", "11:00", "14:00", "15:00"]},
-        {"name": "Dr. Brown", "department": "Orthopedics", "slots": ["10:00", "11:00", "14:00", "15:00", "16:00"]},
-        {"name": "Dr. Davis", "department": "Dermatology", "slots": ["09:00", "10:00", "11:00", "15:00", "16:00"]},
+        {"name": "Dr. Smith", "department": "General Medicine", "slots": ("09:00", "10:00", "11:00", "14:00", "15:00", "16:00")},
+        {"name": "Dr. Johnson", "department": "Cardiology", "slots": ("09:30", "10:30", "11:30", "14:30", "15:30")},
+        {"name": "Dr. Williams", "department": "Pediatrics", "slots": ("08:00", "09:00", "10:00", "11:00", "14:00", "15:00")},
+        {"name": "Dr. Brown", "department": "Orthopedics", "slots": ("10:00", "11:00", "14:00", "15:00", "16:00")},
+        {"name": "Dr. Davis", "department": "Dermatology", "slots": ("09:00", "10:00", "11:00", "15:00", "16:00")},
     ]
     
+    # Intern names and departments so comparisons with loaded records can match on identity
+    for _doctor in DEFAULT_DOCTORS:
+        _doctor["name"] = sys.intern(_doctor["name"])
+        _doctor["department"] = sys.intern(_doctor["department"])
+    del _doctor
+    
+    # Lookup tables derived once from DEFAULT_DOCTORS
+    _DOCTORS = tuple(DEFAULT_DOCTORS)
+    _BY_NAME = {doctor["name"]: doctor for doctor in DEFAULT_DOCTORS}
+    _NAMES = tuple(doctor["name"] for doctor in DEFAULT_DOCTORS)
+    _DEPARTMENT_BY_NAME = {doctor["name"]: doctor["department"] for doctor in DEFAULT_DOCTORS}
+    _SLOTS_BY_NAME = {doctor["name"]: doctor["slots"] for doctor in DEFAULT_DOCTORS}
+    _DEPARTMENTS = tuple(sorted({doctor["department"] for doctor in DEFAULT_DOCTORS}))
+    
     @classmethod
-    def get_available_slots(cls, doctor_name: str, date: str, existing_appointments: List[Appointment]) -> List[str]:
+    def get_available_slots(cls, doctor_name: str, date: str,
+                            existing_appointments: Union[List[Appointment], AppointmentIndex]) -> List[str]:
         """Get available time slots for a doctor on a specific date"""
         # Find doctor's default slots
-        doctor_slots = []
-        for doctor in cls.DEFAULT_DOCTORS:
-            if doctor["name"] == doctor_name:
-                doctor_slots = doctor["slots"].copy()
-                break
+        doctor_slots = cls._SLOTS_BY_NAME.get(doctor_name)
         
         if not doctor_slots:
             return []
         
         # Remove booked slots
-        booked_slots = []
-        for appointment in existing_appointments:
-            if (appointment.doctor_name == doctor_name and 
-                appointment.appointment_date == date and 
-                appointment.status in ["Scheduled", "Completed"]):
-                booked_slots.append(appointment.appointment_time)
+        if isinstance(existing_appointments, AppointmentIndex):
+            booked_slots = existing_appointments.get_booked_times(doctor_name, date)
+        else:
+            # Date first: it rules out far more appointments than the doctor does
+            booked_slots = {appointment.appointment_time for appointment in existing_appointments
+                            if appointment.appointment_date == date and
+                            appointment.doctor_name == doctor_name and
+                            appointment.status in BOOKED_STATUSES}
+        
+        # Nothing booked, every slot is free
+        if not booked_slots:
+            return list(doctor_slots)
         
         available_slots = [slot for slot in doctor_slots if slot not in booked_slots]
         return available_slots
     
     @classmethod
-    def get_doctors(cls) -> List[Dict]:
-        """Get list of all doctors"""
-        return cls.DEFAULT_DOCTORS.copy()
+    def get_doctors(cls) -> Tuple[Dict, ...]:
+        """Get all doctors (shared, read-only)"""
+        return cls._DOCTORS
+    
+    @classmethod
+    def get_doctor_names(cls) -> Tuple[str, ...]:
+        """Get all doctor names in schedule order"""
+        return cls._NAMES
+    
+    @classmethod
+    def get_doctor(cls, doctor_name: str) -> Optional[Dict]:
+        """Get a doctor by name"""
+        return cls._BY_NAME.get(doctor_name)
+    
+    @classmethod
+    def get_department(cls, doctor_name: str) -> str:
+        """Get a doctor's department, or an empty string for an unknown doctor"""
+        return cls._DEPARTMENT_BY_NAME.get(doctor_name, "")
     
     @classmethod
-    def get_departments(cls) -> List[str]:
-        """Get list of all departments"""
-        departments = list(set(doctor["department"] for doctor in cls.DEFAULT_DOCTORS))
-        return sorted(departments)
+    def get_departments(cls) -> Tuple[str, ...]:
+        """Get sorted tuple of all departments"""
+        return cls._DEPARTMENTS
@@ -2,13 +2,70 @@
 OPD (Outpatient Department) Model - Handles OPD visit data structure and operations
 """
 
-import json
-from datetime import datetime
+import itertools
+import sys
+import time
+from collections import deque
+from datetime import date, datetime
 from typing import Dict, List, Optional
 
+from utils.date_utils import parse_ymd, parse_ymd_hms
+
+# Millisecond-seeded visit ID sequence
+_id_counter = itertools.count(int(time.time() * 1000))
+
+class VitalSigns:
+    """Vital signs recorded during an OPD visit"""
+    
+    __slots__ = ('blood_pressure', 'temperature', 'pulse', 'weight', 'height', 'recorded_at')
+    
+    def __init__(self, blood_pressure: str = "", temperature: str = "", pulse: str = "",
+                 weight: str = "", height: str = "", recorded_at: str = ""):
+        """Initialize a new vital signs record"""
+        self.blood_pressure = blood_pressure
+        self.temperature = temperature
+        self.pulse = pulse
+        self.weight = weight
+        self.height = height
+        self.recorded_at = recorded_at
+    
+    def to_dict(self) -> Dict:
+        """Convert vital signs to dictionary"""
+        return {
+            'blood_pressure': self.blood_pressure,
+            'temperature': self.temperature,
+            'pulse': self.pulse,
+            'weight': self.weight,
+            'height': self.height,
+            'recorded_at': self.recorded_at
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> Optional['VitalSigns']:
+        """Create vital signs from dictionary (None if nothing was recorded)"""
+        if not data:
+            return None
+        return cls(
+            blood_pressure=data.get('blood_pressure', ''),
+            temperature=data.get('temperature', ''),
+            pulse=data.get('pulse', ''),
+            weight=data.get('weight', ''),
+            height=data.get('height', ''),
+            recorded_at=data.get('recorded_at', '')
+        )
+
 class OPDVisit:
     """OPD Visit model class for managing outpatient visit information"""
     
+    __slots__ = ('visit_id', 'patient_id', 'doctor_name', '_visit_date', 'symptoms',
+                 'diagnosis', 'prescription', 'lab_tests', 'follow_up_date', 'notes',
+                 'status', 'vital_signs', '_dt', '_search_blob', '_summary')
+    
+    # Fields covered by search_matches and get_visit_summary; assigning any of them
+    # drops the cached search text and summary
+    _SEARCH_FIELDS = frozenset(('visit_id', 'patient_id', 'doctor_name', 'symptoms',
+                                'diagnosis', 'status', 'visit_date'))
+    
     def __init__(self, visit_id: str = None, patient_id: str = "", 
                  doctor_name: str = "", visit_date: str = None,
                  symptoms: str = "", diagnosis: str = "", 
@@ -16,6 +73,9 @@ class OPDVisit:
                  follow_up_date: str = "", notes: str = "",
                  status: str = "In Progress"):
         """Initialize a new OPD visit instance"""
+        self._dt = None  # Cached visit datetime, reset when visit_date changes
+        self._search_blob = None
+        self._summary = None
         self.visit_id = visit_id or self.generate_visit_id()
         self.patient_id = patient_id
         self.doctor_name = doctor_name
@@ -27,13 +87,35 @@ class OPDVisit:
         self.follow_up_date = follow_up_date
         self.notes = notes
         self.status = status  # In Progress, Completed, Follow-up Required
-        self.vital_signs = {}  # Blood pressure, temperature, etc.
+        self.vital_signs: Optional[VitalSigns] = None
         
+    def __setattr__(self, attr: str, value):
+        """Set an attribute, invalidating the cached search text and summary when needed"""
+        object.__setattr__(self, attr, value)
+        if attr in OPDVisit._SEARCH_FIELDS:
+            object.__setattr__(self, '_search_blob', None)
+            object.__setattr__(self, '_summary', None)
+    
     @staticmethod
     def generate_visit_id() -> str:
         """Generate a unique visit ID"""
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        return f"V{timestamp}"
+        return f"V{next(_id_counter):014d}"
+    
+    @property
+    def visit_date(self) -> str:
+        """Visit timestamp in YYYY-MM-DD HH:MM:SS format"""
+        return self._visit_date
+    
+    @visit_date.setter
+    def visit_date(self, value: str):
+        self._visit_date = value
+        self._dt = None
+    
+    def get_datetime(self) -> datetime:
+        """Get visit datetime object"""
+        if self._dt is None:
+            self._dt = parse_ymd_hms(self.visit_date)
+        return self._dt
     
     def to_dict(self) -> Dict:
         """Convert OPD visit object to dictionary"""
@@ -49,7 +131,7 @@ class OPDVisit:
             'follow_up_date': self.follow_up_date,
             'notes': self.notes,
             'status': self.status,
-            'vital_signs': self.vital_signs
+            'vital_signs': self.vital_signs.to_dict() if self.vital_signs else {}
         }
     
     @classmethod
@@ -58,7 +140,7 @@ class OPDVisit:
         visit = cls(
             visit_id=data.get('visit_id'),
             patient_id=data.get('patient_id', ''),
-            doctor_name=data.get('doctor_name', ''),
+            doctor_name=sys.intern(data.get('doctor_name', '')),
             visit_date=data.get('visit_date'),
             symptoms=data.get('symptoms', ''),
             diagnosis=data.get('diagnosis', ''),
@@ -66,9 +148,34 @@ class OPDVisit:
             lab_tests=data.get('lab_tests', ''),
             follow_up_date=data.get('follow_up_date', ''),
             notes=data.get('notes', ''),
-            status=data.get('status', 'In Progress')
+            status=sys.intern(data.get('status', 'In Progress'))
         )
-        visit.vital_signs = data.get('vital_signs', {})
+        visit.vital_signs = VitalSigns.from_dict(data.get('vital_signs'))
+        return visit
+    
+    @classmethod
+    def from_dict_fast(cls, data: Dict) -> 'OPDVisit':
+        """Create OPD visit object from stored data, skipping constructor defaults (bulk loads)"""
+        if not data.get('visit_id') or not data.get('visit_date'):
+            return cls.from_dict(data)
+        
+        visit = cls.__new__(cls)
+        set_field = object.__setattr__
+        set_field(visit, 'visit_id', data['visit_id'])
+        set_field(visit, 'patient_id', data.get('patient_id', ''))
+        set_field(visit, 'doctor_name', sys.intern(data.get('doctor_name', '')))
+        set_field(visit, '_visit_date', data['visit_date'])
+        set_field(visit, 'symptoms', data.get('symptoms', ''))
+        set_field(visit, 'diagnosis', data.get('diagnosis', ''))
+        set_field(visit, 'prescription', data.get('prescription', ''))
+        set_field(visit, 'lab_tests', data.get('lab_tests', ''))
+        set_field(visit, 'follow_up_date', data.get('follow_up_date', ''))
+        set_field(visit, 'notes', data.get('notes', ''))
+        set_field(visit, 'status', sys.intern(data.get('status', 'In Progress')))
+        set_field(visit, 'vital_signs', VitalSigns.from_dict(data.get('vital_signs')))
+        set_field(visit, '_dt', None)
+        set_field(visit, '_search_blob', None)
+        set_field(visit, '_summary', None)
         return visit
     
     def validate(self) -> tuple[bool, str]:
@@ -85,7 +192,7 @@ class OPDVisit:
         # Validate follow-up date format if provided
         if self.follow_up_date.strip():
             try:
-                datetime.strptime(self.follow_up_date, "%Y-%m-%d")
+                parse_ymd(self.follow_up_date)
             except ValueError:
                 return False, "Invalid follow-up date format. Use YYYY-MM-DD"
         
@@ -94,64 +201,57 @@ class OPDVisit:
     def set_vital_signs(self, blood_pressure: str = "", temperature: str = "", 
                        pulse: str = "", weight: str = "", height: str = ""):
         """Set vital signs for the visit"""
-        self.vital_signs = {
-            'blood_pressure': blood_pressure,
-            'temperature': temperature,
-            'pulse': pulse,
-            'weight': weight,
-            'height': height,
-            'recorded_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+        self.vital_signs = VitalSigns(blood_pressure, temperature, pulse, weight, height,
+                                      datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
     
     def get_visit_summary(self) -> Dict:
         """Get a summary of the visit for display"""
-        return {
-            'Visit ID': self.visit_id,
-            'Patient ID': self.patient_id,
-            'Doctor': self.doctor_name,
-            'Date': self.visit_date,
-            'Status': self.status,
-            'Symptoms': self.symptoms[:100] + "..." if len(self.symptoms) > 100 else self.symptoms,
-            'Diagnosis': self.diagnosis[:100] + "..." if len(self.diagnosis) > 100 else self.diagnosis
-        }
+        if self._summary is None:
+            self._summary = {
+                'Visit ID': self.visit_id,
+                'Patient ID': self.patient_id,
+                'Doctor': self.doctor_name,
+                'Date': self.visit_date,
+                'Status': self.status,
+                'Symptoms': f"{self.symptoms[:100]}..." if len(self.symptoms) > 100 else self.symptoms,
+                'Diagnosis': f"{self.diagnosis[:100]}..." if len(self.diagnosis) > 100 else self.diagnosis
+            }
+        return dict(self._summary)
     
-    def is_today(self) -> bool:
-        """Check if visit is from today"""
-        visit_date = datetime.strptime(self.visit_date, "%Y-%m-%d %H:%M:%S").date()
-        return visit_date == datetime.now().date()
+    def is_today(self, now: Optional[datetime] = None) -> bool:
+        """Check if visit is from today (pass now to share one clock read in loops)"""
+        return self.get_datetime().date() == (now.date() if now else date.today())
     
     def needs_follow_up(self) -> bool:
         """Check if visit requires follow-up"""
         return bool(self.follow_up_date.strip()) or self.status == "Follow-up Required"
     
-    def is_follow_up_due(self) -> bool:
+    def is_follow_up_due(self, now: Optional[datetime] = None) -> bool:
         """Check if follow-up is due"""
         if not self.follow_up_date.strip():
             return False
         
         try:
-            follow_up_date = datetime.strptime(self.follow_up_date, "%Y-%m-%d").date()
-            return follow_up_date <= datetime.now().date()
+            return parse_ymd(self.follow_up_date) <= (now.date() if now else date.today())
         except ValueError:
             return False
     
+    def get_search_text(self) -> str:
+        """Get the lowercased text searched by search_matches"""
+        if self._search_blob is None:
+            # Fields are joined with a separator that cannot appear in a query
+            self._search_blob = '\x1f'.join((
+                self.visit_id, self.patient_id, self.doctor_name, self.symptoms,
+                self.diagnosis, self.status, self.visit_date
+            )).lower()
+        return self._search_blob
+    
     def search_matches(self, query: str) -> bool:
         """Check if OPD visit matches search query"""
         query = query.lower().strip()
         if not query:
             return True
-        
-        searchable_fields = [
-            self.visit_id.lower(),
-            self.patient_id.lower(),
-            self.doctor_name.lower(),
-            self.symptoms.lower(),
-            self.diagnosis.lower(),
-            self.status.lower(),
-            self.visit_date
-        ]
-        
-        return any(query in field for field in searchable_fields)
+        return query in self.get_search_text()
     
     def mark_completed(self):
         """Mark the visit as completed"""
@@ -168,58 +268,112 @@ class OPDQueue:
     
     def __init__(self):
         """Initialize OPD queue"""
-        self.queue = []  # List of patient IDs in queue
-        self.completed_today = []  # List of completed patient names for announcements
+        # Removed patients are left in _entries and skipped, so removal is O(1);
+        # sequence numbers keep a re-added patient from reviving an old entry
+        self._entries = deque()  # (sequence, patient ID) in arrival order
+        self._members = {}  # patient ID -> sequence of its live entry
+        self._sequence = 0
+        self._stale = 0  # Removed entries still held in _entries
         
+        # Completed patients for announcements, split by announcement state
+        self._pending = deque()  # Not yet announced, in completion order
+        self._pending_by_name = {}  # Patient name -> deque of pending entries
+        self._announced = deque()
+        
+    def _is_live(self, entry) -> bool:
+        """Check if a queue entry has not been removed"""
+        return self._members.get(entry[1]) == entry[0]
+    
+    def _compact(self):
+        """Drop removed entries from the head, rebuilding once they outnumber live ones"""
+        while self._entries and not self._is_live(self._entries[0]):
+            self._entries.popleft()
+            self._stale -= 1
+        if self._stale > len(self._members):
+            self._entries = deque(entry for entry in self._entries if self._is_live(entry))
+            self._stale = 0
+    
     def add_patient(self, patient_id: str):
         """Add patient to OPD queue"""
-        if patient_id not in self.queue:
-            self.queue.append(patient_id)
+        if patient_id not in self._members:
+            self._sequence += 1
+            self._members[patient_id] = self._sequence
+            self._entries.append((self._sequence, patient_id))
     
     def remove_patient(self, patient_id: str):
         """Remove patient from OPD queue"""
-        if patient_id in self.queue:
-            self.queue.remove(patient_id)
+        if self._members.pop(patient_id, None) is not None:
+            self._stale += 1
+            self._compact()
     
     def get_next_patient(self) -> Optional[str]:
         """Get next patient in queue"""
-        return self.queue[0] if self.queue else None
+        return self._entries[0][1] if self._entries else None
     
     def get_queue_position(self, patient_id: str) -> int:
         """Get patient's position in queue (1-based)"""
-        try:
-            return self.queue.index(patient_id) + 1
-        except ValueError:
+        sequence = self._members.get(patient_id)
+        if sequence is None:
             return -1
+        
+        position = 0
+        for entry in self._entries:
+            if self._is_live(entry):
+                position += 1
+                if entry[0] == sequence:
+                    break
+        return position
+    
+    def clear_queue(self):
+        """Remove all patients from the queue"""
+        self._entries.clear()
+        self._members.clear()
+        self._stale = 0
     
     def mark_patient_completed(self, patient_name: str):
         """Mark patient as completed and add to announcement queue"""
-        self.completed_today.append({
+        entry = {
             'name': patient_name,
             'completed_at': datetime.now().strftime("%H:%M:%S"),
             'announced': False
-        })
+        }
+        self._pending.append(entry)
+        self._pending_by_name.setdefault(patient_name, deque()).append(entry)
     
     def get_pending_announcements(self) -> List[Dict]:
         """Get list of patients pending announcement"""
-        return [patient for patient in self.completed_today if not patient['announced']]
+        return list(self._pending)
     
     def mark_announced(self, patient_name: str):
         """Mark patient as announced"""
-        for patient in self.completed_today:
-            if patient['name'] == patient_name and not patient['announced']:
-                patient['announced'] = True
-                break
+        entries = self._pending_by_name.get(patient_name)
+        if not entries:
+            return
+        
+        entry = entries.popleft()
+        if not entries:
+            del self._pending_by_name[patient_name]
+        
+        entry['announced'] = True
+        self._announced.append(entry)
+        
+        # Announcements are normally made in completion order
+        if self._pending[0] is entry:
+            self._pending.popleft()
+        else:
+            self._pending.remove(entry)
     
     def clear_completed_today(self):
         """Clear today's completed patients list"""
-        self.completed_today.clear()
-        self.queue.clear()
+        self._pending.clear()
+        self._pending_by_name.clear()
+        self._announced.clear()
+        self.clear_queue()
     
     def get_queue_summary(self) -> Dict:
         """Get queue summary statistics"""
         return {
-            'total_in_queue': len(self.queue),
-            'completed_today': len(self.completed_today),
-            'pending_announcements': len(self.get_pending_announcements())
+            'total_in_queue': len(self._members),
+            'completed_today': len(self._pending) + len(self._announced),
+            'pending_announcements': len(self._pending)
         }
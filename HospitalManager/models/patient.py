@@ -2,17 +2,32 @@
 Patient Model - Handles patient data structure and operations
 """
 
-import json
+import itertools
+import sys
+import time
 from datetime import datetime
 from typing import Dict, List, Optional
 
+# ID sequence seeded from the current time in milliseconds, so IDs created within
+# the same second stay unique and later sessions continue above earlier ones
+# (next() on itertools.count is atomic, so no lock is needed)
+_id_counter = itertools.count(int(time.time() * 1000))
+
 class Patient:
     """Patient model class for managing patient information"""
     
+    __slots__ = ('patient_id', 'name', 'age', 'gender', 'contact', 'address',
+                 'phone', 'registration_date', 'appointments', 'opd_visits',
+                 'medical_history', '_search_blob')
+    
+    # Fields covered by search_matches; assigning any of them drops the cached search text
+    _SEARCH_FIELDS = frozenset(('name', 'patient_id', 'phone', 'gender', 'contact', 'address', 'age'))
+    
     def __init__(self, patient_id: str = None, name: str = "", age: int = 0, 
                  gender: str = "", contact: str = "", address: str = "", 
                  phone: str = "", registration_date: str = None):
         """Initialize a new patient instance"""
+        self._search_blob = None
         self.patient_id = patient_id or self.generate_patient_id()
         self.name = name
         self.age = age
@@ -25,12 +40,16 @@ class Patient:
         self.opd_visits = []    # List of OPD visit IDs
         self.medical_history = []  # Medical history entries
         
+    def __setattr__(self, attr: str, value):
+        """Set an attribute, invalidating the cached search text when needed"""
+        object.__setattr__(self, attr, value)
+        if attr in Patient._SEARCH_FIELDS:
+            object.__setattr__(self, '_search_blob', None)
+    
     @staticmethod
     def generate_patient_id() -> str:
         """Generate a unique patient ID"""
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        return f"P{timestamp}"
+        return f"P{next(_id_counter):014d}"
     
     def to_dict(self) -> Dict:
         """Convert patient object to dictionary"""
@@ -55,15 +74,38 @@ class Patient:
             patient_id=data.get('patient_id'),
             name=data.get('name', ''),
             age=data.get('age', 0),
-            gender=data.get('gender', ''),
+            gender=sys.intern(data.get('gender', '')),
             contact=data.get('contact', ''),
             address=data.get('address', ''),
             phone=data.get('phone', ''),
             registration_date=data.get('registration_date')
         )
-        patient.appointments = data.get('appointments', [])
-        patient.opd_visits = data.get('opd_visits', [])
-        patient.medical_history = data.get('medical_history', [])
+        patient.appointments = list(data.get('appointments', ()))
+        patient.opd_visits = list(data.get('opd_visits', ()))
+        patient.medical_history = list(data.get('medical_history', ()))
+        return patient
+    
+    @classmethod
+    def from_dict_fast(cls, data: Dict) -> 'Patient':
+        """Create patient object from stored data, skipping constructor defaults (bulk loads)"""
+        if not data.get('patient_id') or not data.get('registration_date'):
+            return cls.from_dict(data)
+        
+        patient = cls.__new__(cls)
+        set_field = object.__setattr__
+        set_field(patient, 'patient_id', data['patient_id'])
+        set_field(patient, 'name', data.get('name', ''))
+        set_field(patient, 'age', data.get('age', 0))
+        set_field(patient, 'gender', sys.intern(data.get('gender', '')))
+        set_field(patient, 'contact', data.get('contact', ''))
+        set_field(patient, 'address', data.get('address', ''))
+        set_field(patient, 'phone', data.get('phone', ''))
+        set_field(patient, 'registration_date', data['registration_date'])
+        # Copy the lists so edits never reach the data manager's cached file contents
+        set_field(patient, 'appointments', list(data.get('appointments', ())))
+        set_field(patient, 'opd_visits', list(data.get('opd_visits', ())))
+        set_field(patient, 'medical_history', list(data.get('medical_history', ())))
+        set_field(patient, '_search_blob', None)
         return patient
     
     def validate(self) -> tuple[bool, str]:
@@ -97,23 +139,22 @@ class Patient:
             return self.medical_history[-1]
         return None
     
+    def get_search_text(self) -> str:
+        """Get the lowercased text searched by search_matches"""
+        if self._search_blob is None:
+            # Fields are joined with a separator that cannot appear in a query
+            self._search_blob = '\x1f'.join((
+                self.name, self.patient_id, self.phone, self.gender,
+                self.contact, self.address, str(self.age)
+            )).lower()
+        return self._search_blob
+    
     def search_matches(self, query: str) -> bool:
         """Check if patient matches search query"""
         query = query.lower().strip()
         if not query:
             return True
-        
-        searchable_fields = [
-            self.name.lower(),
-            self.patient_id.lower(),
-            self.phone.lower(),
-            self.gender.lower(),
-            self.contact.lower(),
-            self.address.lower(),
-            str(self.age)
-        ]
-        
-        return any(query in field for field in searchable_fields)
+        return query in self.get_search_text()
     
     def __str__(self) -> str:
         """String representation of patient"""
@@ -4,9 +4,96 @@ Report Model - Handles report generation and data analysis
 
 import json
 import csv
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from collections import defaultdict, Counter
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date as date_cls, datetime, timedelta
+from functools import wraps
+from operator import attrgetter
+from typing import Dict, List, Optional, Any, Tuple
+from collections import defaultdict, Counter, OrderedDict
+
+# Report keys written separately (or not at all) in the summary CSV layout
+_SUMMARY_SKIP_KEYS = frozenset(('report_type', 'generated_at', 'date_range', 'appointments', 'consultations'))
+
+# Fields carried by report rows; also the column layouts of the record-level CSV exports
+_APPOINTMENT_ROW_FIELDS = ('appointment_id', 'patient_id', 'doctor_name',
+                           'department', 'appointment_date', 'appointment_time', 'status')
+_VISIT_ROW_FIELDS = ('visit_id', 'patient_id', 'doctor_name', 'visit_date',
+                     'symptoms', 'diagnosis', 'status')
+_PATIENT_ROW_FIELDS = ('patient_id', 'name', 'age', 'gender', 'phone', 'registration_date')
+
+def _report_rows(records: List, fields: tuple) -> List[Dict]:
+    """Build plain, JSON-serializable row dicts holding only the given fields of each record"""
+    values = attrgetter(*fields)
+    return [dict(zip(fields, values(record))) for record in records]
+
+def _write_csv_rows(csvfile, fieldnames: tuple, records: List[Dict]):
+    """Write a header and one row per record dict, with missing fields left empty"""
+    writer = csv.writer(csvfile)
+    writer.writerow(fieldnames)
+    writer.writerows([record.get(k, '') for k in fieldnames] for record in records)
+
+def _versioned_lru_cache(maxsize: int = 64, include_today: bool = False):
+    """Memoize a ReportGenerator method until the data manager's version changes
+    
+    Each call returns a shallow copy of the cached report with a fresh 'generated_at' stamp;
+    nested values are still shared, so callers must treat them as read-only.
+    With include_today the key also holds the current date, so results roll over at midnight.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            self.data_manager.check_for_external_changes()
+            key = (args, tuple(sorted(kwargs.items())), self.data_manager.version,
+                   date_cls.today() if include_today else None)
+            with self._cache_lock:
+                cache = self._report_cache.setdefault(method.__name__, OrderedDict())
+                entry = cache.get(key)
+                if entry is not None:
+                    cache.move_to_end(key)
+            
+            if entry is None:
+                # Cache the report without its timestamp, which is set per call below
+                payload = dict(method(self, *args, **kwargs))
+                entry = (payload, payload.pop('generated_at', None) is not None)
+                
+                with self._cache_lock:
+                    cache[key] = entry
+                    if len(cache) > maxsize:
+                        cache.popitem(last=False)
+            
+            payload, stamped = entry
+            result = dict(payload)
+            if stamped:
+                result['generated_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            return result
+        return wrapper
+    return decorator
+
+def _aggregate_visits(visits: List) -> Tuple[Counter, Counter, Counter]:
+    """Count visits by day, doctor and status in a single pass"""
+    daily_counts = Counter()
+    doctor_counts = Counter()
+    status_counts = Counter()
+    for visit in visits:
+        daily_counts[visit.visit_date[:10]] += 1
+        doctor_counts[visit.doctor_name] += 1
+        status_counts[visit.status] += 1
+    return daily_counts, doctor_counts, status_counts
+
+def _aggregate_appointments(appointments: List) -> Tuple[Counter, Counter, Counter, Counter]:
+    """Count appointments by status, doctor, department and day in a single pass"""
+    status_counts = Counter()
+    doctor_counts = Counter()
+    department_counts = Counter()
+    daily_counts = Counter()
+    for appointment in appointments:
+        status_counts[appointment.status] += 1
+        doctor_counts[appointment.doctor_name] += 1
+        department_counts[appointment.department] += 1
+        daily_counts[appointment.appointment_date] += 1
+    return status_counts, doctor_counts, department_counts, daily_counts
 
 class ReportGenerator:
     """Report generator class for creating various hospital reports"""
@@ -14,46 +101,115 @@ class ReportGenerator:
     def __init__(self, data_manager):
         """Initialize report generator with data manager"""
         self.data_manager = data_manager
+        
+        # Exported CSV files are written here; created once rather than on every export
+        self.exports_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'exports')
+        os.makedirs(self.exports_dir, exist_ok=True)
+        
+        # Records bucketed by doctor and by YYYY-MM-DD, plus date-sorted lists with
+        # parallel key lists for bisecting and parallel field columns for counting;
+        # all rebuilt when the data version changes
+        self._indexed_version = None
+        self._visits_sorted: List = []
+        self._visit_keys: List[str] = []
+        self._visit_columns: Dict[str, List[str]] = {'day': [], 'doctor': [], 'status': []}
+        self._appts_sorted: List = []
+        self._appt_keys: List[str] = []
+        self._appt_columns: Dict[str, List[str]] = {'doctor': [], 'department': [], 'status': []}
+        self._visits_by_doctor: Dict[str, List] = {}
+        self._appts_by_doctor: Dict[str, List] = {}
+        self._visits_by_date: Dict[str, List] = {}
+        self._appts_by_date: Dict[str, List] = {}
+        
+        # Memoized report results per method, see _versioned_lru_cache
+        self._report_cache: Dict[str, OrderedDict] = {}
+        self._cache_lock = threading.Lock()
     
+    def _rebuild_indices(self):
+        """Rebuild the doctor and date indices if the underlying data has changed"""
+        self.data_manager.check_for_external_changes()
+        version = self.data_manager.version
+        if self._indexed_version == version:
+            return
+        
+        # Sorting is stable, so records on the same date keep their stored order
+        visit_date = attrgetter('visit_date')
+        visits = sorted(self.data_manager.get_opd_visits(), key=visit_date)
+        visit_keys = list(map(visit_date, visits))
+        visits_by_doctor = defaultdict(list)
+        visits_by_date = defaultdict(list)
+        for visit, key in zip(visits, visit_keys):
+            visits_by_doctor[visit.doctor_name].append(visit)
+            visits_by_date[key[:10]].append(visit)
+        visit_columns = {
+            'day': [key[:10] for key in visit_keys],
+            'doctor': list(map(attrgetter('doctor_name'), visits)),
+            'status': list(map(attrgetter('status'), visits))
+        }
+        
+        appointment_date = attrgetter('appointment_date')
+        appointments = sorted(self.data_manager.get_appointments(), key=appointment_date)
+        appt_keys = list(map(appointment_date, appointments))
+        appts_by_doctor = defaultdict(list)
+        appts_by_date = defaultdict(list)
+        for appointment, key in zip(appointments, appt_keys):
+            appts_by_doctor[appointment.doctor_name].append(appointment)
+            appts_by_date[key].append(appointment)
+        appt_columns = {
+            'doctor': list(map(attrgetter('doctor_name'), appointments)),
+            'department': list(map(attrgetter('department'), appointments)),
+            'status': list(map(attrgetter('status'), appointments))
+        }
+        
+        # Reports run on worker threads, so publish the finished indices in one step
+        (self._visits_sorted, self._visit_keys, self._visit_columns,
+         self._appts_sorted, self._appt_keys, self._appt_columns,
+         self._visits_by_doctor, self._visits_by_date,
+         self._appts_by_doctor, self._appts_by_date) = (
+            visits, visit_keys, visit_columns, appointments, appt_keys, appt_columns,
+            dict(visits_by_doctor), dict(visits_by_date),
+            dict(appts_by_doctor), dict(appts_by_date))
+        self._indexed_version = version
+    
+    @_versioned_lru_cache()
     def generate_patient_visits_report(self, start_date: str, end_date: str, 
-                                     doctor_filter: str = "") -> Dict[str, Any]:
-        """Generate patient visits report for date range"""
+                                     doctor_filter: str = "", include_rows: bool = True) -> Dict[str, Any]:
+        """Generate patient visits report for date range (include_rows=False omits the visit list)"""
         try:
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+            start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
+            end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
         except ValueError:
             return {"error": "Invalid date format. Use YYYY-MM-DD"}
         
-        # Get all OPD visits in date range
-        opd_visits = self.data_manager.get_opd_visits()
-        filtered_visits = []
-        
-        for visit in opd_visits:
-            try:
-                visit_dt = datetime.strptime(visit.visit_date, "%Y-%m-%d %H:%M:%S")
-                if start_dt <= visit_dt.date() <= end_dt.date():
-                    if not doctor_filter or visit.doctor_name == doctor_filter:
-                        filtered_visits.append(visit)
-            except ValueError:
-                continue
-        
-        # Generate statistics
+        # ISO dates order the same way as strings, so rows are filtered without parsing;
+        # full timestamps are compared against the half-open range [start, day after end)
+        start_key = start_dt.isoformat()
+        stop_key = (end_dt + timedelta(days=1)).isoformat()
+        
+        # Get OPD visits in date range and generate statistics
+        self._rebuild_indices()
+        
+        if doctor_filter:
+            # Start from the doctor's own visits so other doctors' rows are never examined
+            filtered_visits = [visit for visit in self._visits_by_doctor.get(doctor_filter, ())
+                               if start_key <= visit.visit_date < stop_key]
+            daily_counts, doctor_counts, status_counts = _aggregate_visits(filtered_visits)
+        else:
+            # Counting column slices keeps the whole loop inside Counter's C helper
+            keys = self._visit_keys
+            lo, hi = bisect_left(keys, start_key), bisect_left(keys, stop_key)
+            filtered_visits = self._visits_sorted[lo:hi]
+            columns = self._visit_columns
+            daily_counts = Counter(columns['day'][lo:hi])
+            doctor_counts = Counter(columns['doctor'][lo:hi])
+            status_counts = Counter(columns['status'][lo:hi])
         total_visits = len(filtered_visits)
-        daily_counts = defaultdict(int)
-        doctor_counts = defaultdict(int)
-        status_counts = defaultdict(int)
-        
-        for visit in filtered_visits:
-            visit_date = datetime.strptime(visit.visit_date, "%Y-%m-%d %H:%M:%S").date()
-            daily_counts[visit_date.strftime("%Y-%m-%d")] += 1
-            doctor_counts[visit.doctor_name] += 1
-            status_counts[visit.status] += 1
         
         # Calculate averages
         days_in_range = (end_dt - start_dt).days + 1
         avg_daily_visits = total_visits / days_in_range if days_in_range > 0 else 0
         
-        return {
+        report = {
             "report_type": "Patient Visits Report",
             "date_range": f"{start_date} to {end_date}",
             "doctor_filter": doctor_filter or "All Doctors",
@@ -62,50 +218,49 @@ class ReportGenerator:
             "daily_breakdown": dict(daily_counts),
             "doctor_breakdown": dict(doctor_counts),
             "status_breakdown": dict(status_counts),
-            "visits": [visit.to_dict() for visit in filtered_visits],
             "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
+        
+        if include_rows:
+            report["visits"] = _report_rows(filtered_visits, _VISIT_ROW_FIELDS)
+        return report
     
+    @_versioned_lru_cache()
     def generate_appointment_report(self, start_date: str, end_date: str, 
-                                  doctor_filter: str = "") -> Dict[str, Any]:
-        """Generate appointment summary report"""
+                                  doctor_filter: str = "", include_rows: bool = True) -> Dict[str, Any]:
+        """Generate appointment summary report (include_rows=False omits the appointment list)"""
         try:
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+            start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
+            end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
         except ValueError:
             return {"error": "Invalid date format. Use YYYY-MM-DD"}
         
-        # Get all appointments in date range
-        appointments = self.data_manager.get_appointments()
-        filtered_appointments = []
-        
-        for appointment in appointments:
-            try:
-                appt_dt = datetime.strptime(appointment.appointment_date, "%Y-%m-%d")
-                if start_dt <= appt_dt <= end_dt:
-                    if not doctor_filter or appointment.doctor_name == doctor_filter:
-                        filtered_appointments.append(appointment)
-            except ValueError:
-                continue
-        
-        # Generate statistics
+        start_key, end_key = start_dt.isoformat(), end_dt.isoformat()
+        
+        # Get appointments in date range and generate statistics
+        self._rebuild_indices()
+        
+        if doctor_filter:
+            filtered_appointments = [appt for appt in self._appts_by_doctor.get(doctor_filter, ())
+                                     if start_key <= appt.appointment_date <= end_key]
+            (status_counts, doctor_counts,
+             department_counts, daily_counts) = _aggregate_appointments(filtered_appointments)
+        else:
+            keys = self._appt_keys
+            lo, hi = bisect_left(keys, start_key), bisect_right(keys, end_key)
+            filtered_appointments = self._appts_sorted[lo:hi]
+            columns = self._appt_columns
+            status_counts = Counter(columns['status'][lo:hi])
+            doctor_counts = Counter(columns['doctor'][lo:hi])
+            department_counts = Counter(columns['department'][lo:hi])
+            daily_counts = Counter(keys[lo:hi])
         total_appointments = len(filtered_appointments)
-        status_counts = defaultdict(int)
-        doctor_counts = defaultdict(int)
-        department_counts = defaultdict(int)
-        daily_counts = defaultdict(int)
-        
-        for appointment in filtered_appointments:
-            status_counts[appointment.status] += 1
-            doctor_counts[appointment.doctor_name] += 1
-            department_counts[appointment.department] += 1
-            daily_counts[appointment.appointment_date] += 1
         
         # Calculate completion rate
         completed = status_counts.get("Completed", 0)
         completion_rate = (completed / total_appointments * 100) if total_appointments > 0 else 0
         
-        return {
+        report = {
             "report_type": "Appointment Summary Report",
             "date_range": f"{start_date} to {end_date}",
             "doctor_filter": doctor_filter or "All Doctors",
@@ -115,61 +270,51 @@ class ReportGenerator:
             "doctor_breakdown": dict(doctor_counts),
             "department_breakdown": dict(department_counts),
             "daily_breakdown": dict(daily_counts),
-            "appointments": [appointment.to_dict() for appointment in filtered_appointments],
             "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
+        
+        if include_rows:
+            report["appointments"] = _report_rows(filtered_appointments, _APPOINTMENT_ROW_FIELDS)
+        return report
     
+    @_versioned_lru_cache()
     def generate_doctor_consultation_report(self, doctor_name: str, 
-                                          start_date: str, end_date: str) -> Dict[str, Any]:
-        """Generate doctor-wise consultation report"""
+                                          start_date: str, end_date: str,
+                                          include_rows: bool = True) -> Dict[str, Any]:
+        """Generate doctor-wise consultation report (include_rows=False omits the record lists)"""
         try:
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+            start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
+            end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
         except ValueError:
             return {"error": "Invalid date format. Use YYYY-MM-DD"}
         
+        start_key, end_key = start_dt.isoformat(), end_dt.isoformat()
+        stop_key = (end_dt + timedelta(days=1)).isoformat()
+        
         # Get doctor's appointments and OPD visits
-        appointments = self.data_manager.get_appointments()
-        opd_visits = self.data_manager.get_opd_visits()
+        self._rebuild_indices()
         
         doctor_appointments = []
         doctor_visits = []
         
-        for appointment in appointments:
-            if appointment.doctor_name == doctor_name:
-                try:
-                    appt_dt = datetime.strptime(appointment.appointment_date, "%Y-%m-%d")
-                    if start_dt <= appt_dt <= end_dt:
-                        doctor_appointments.append(appointment)
-                except ValueError:
-                    continue
-        
-        for visit in opd_visits:
-            if visit.doctor_name == doctor_name:
-                try:
-                    visit_dt = datetime.strptime(visit.visit_date, "%Y-%m-%d %H:%M:%S")
-                    if start_dt <= visit_dt.date() <= end_dt.date():
-                        doctor_visits.append(visit)
-                except ValueError:
-                    continue
+        for appointment in self._appts_by_doctor.get(doctor_name, ()):
+            if start_key <= appointment.appointment_date <= end_key:
+                doctor_appointments.append(appointment)
+        
+        for visit in self._visits_by_doctor.get(doctor_name, ()):
+            if start_key <= visit.visit_date < stop_key:
+                doctor_visits.append(visit)
         
         # Generate statistics
         total_consultations = len(doctor_visits)
         total_appointments = len(doctor_appointments)
+        daily_consultations = Counter(visit.visit_date[:10] for visit in doctor_visits)
         
-        daily_consultations = defaultdict(int)
-        patient_counts = set()
-        
-        for visit in doctor_visits:
-            visit_date = datetime.strptime(visit.visit_date, "%Y-%m-%d %H:%M:%S").date()
-            daily_consultations[visit_date.strftime("%Y-%m-%d")] += 1
-            patient_counts.add(visit.patient_id)
-        
-        unique_patients = len(patient_counts)
+        unique_patients = len({visit.patient_id for visit in doctor_visits})
         days_in_range = (end_dt - start_dt).days + 1
         avg_daily_consultations = total_consultations / days_in_range if days_in_range > 0 else 0
         
-        return {
+        report = {
             "report_type": "Doctor Consultation Report",
             "doctor_name": doctor_name,
             "date_range": f"{start_date} to {end_date}",
@@ -178,59 +323,39 @@ class ReportGenerator:
             "unique_patients": unique_patients,
             "average_daily_consultations": round(avg_daily_consultations, 2),
             "daily_breakdown": dict(daily_consultations),
-            "consultations": [visit.to_dict() for visit in doctor_visits],
-            "appointments": [appointment.to_dict() for appointment in doctor_appointments],
             "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
+        
+        if include_rows:
+            report["consultations"] = _report_rows(doctor_visits, _VISIT_ROW_FIELDS)
+            report["appointments"] = _report_rows(doctor_appointments, _APPOINTMENT_ROW_FIELDS)
+        return report
     
-    def generate_daily_summary_report(self, date: str) -> Dict[str, Any]:
-        """Generate daily summary report"""
+    @_versioned_lru_cache()
+    def generate_daily_summary_report(self, date: str, include_rows: bool = True) -> Dict[str, Any]:
+        """Generate daily summary report (include_rows=False omits the record lists)"""
         try:
             report_date = datetime.strptime(date, "%Y-%m-%d").date()
         except ValueError:
             return {"error": "Invalid date format. Use YYYY-MM-DD"}
         
         # Get data for the specific date
-        appointments = self.data_manager.get_appointments()
-        opd_visits = self.data_manager.get_opd_visits()
+        self._rebuild_indices()
+        date_key = report_date.isoformat()
         patients = self.data_manager.get_patients()
         
-        # Filter data for the date
-        daily_appointments = [appt for appt in appointments 
-                            if appt.appointment_date == date]
-        
-        daily_visits = []
-        for visit in opd_visits:
-            try:
-                visit_date = datetime.strptime(visit.visit_date, "%Y-%m-%d %H:%M:%S").date()
-                if visit_date == report_date:
-                    daily_visits.append(visit)
-            except ValueError:
-                continue
-        
-        # New patient registrations
-        new_patients = []
-        for patient in patients:
-            try:
-                reg_date = datetime.strptime(patient.registration_date, "%Y-%m-%d %H:%M:%S").date()
-                if reg_date == report_date:
-                    new_patients.append(patient)
-            except ValueError:
-                continue
+        daily_appointments = list(self._appts_by_date.get(date_key, ()))
+        daily_visits = list(self._visits_by_date.get(date_key, ()))
         
         # Generate statistics
-        appointment_status = defaultdict(int)
-        visit_status = defaultdict(int)
-        doctor_consultations = defaultdict(int)
-        
-        for appointment in daily_appointments:
-            appointment_status[appointment.status] += 1
+        appointment_status = Counter(appt.status for appt in daily_appointments)
+        _, doctor_consultations, visit_status = _aggregate_visits(daily_visits)
         
-        for visit in daily_visits:
-            visit_status[visit.status] += 1
-            doctor_consultations[visit.doctor_name] += 1
+        # New patient registrations
+        new_patients = [patient for patient in patients
+                        if patient.registration_date[:10] == date_key]
         
-        return {
+        report = {
             "report_type": "Daily Summary Report",
             "date": date,
             "new_patients": len(new_patients),
@@ -239,41 +364,28 @@ class ReportGenerator:
             "appointment_status": dict(appointment_status),
             "consultation_status": dict(visit_status),
             "doctor_consultations": dict(doctor_consultations),
-            "new_patient_details": [patient.to_dict() for patient in new_patients],
-            "appointments": [appointment.to_dict() for appointment in daily_appointments],
-            "consultations": [visit.to_dict() for visit in daily_visits],
             "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
+        
+        if include_rows:
+            report["new_patient_details"] = _report_rows(new_patients, _PATIENT_ROW_FIELDS)
+            report["appointments"] = _report_rows(daily_appointments, _APPOINTMENT_ROW_FIELDS)
+            report["consultations"] = _report_rows(daily_visits, _VISIT_ROW_FIELDS)
+        return report
     
     def export_to_csv(self, report_data: Dict, filename: str) -> bool:
         """Export report data to CSV file"""
         try:
-            import os
+            filepath = os.path.join(self.exports_dir, filename)
             
-            # Create exports directory if it doesn't exist
-            exports_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'exports')
-            os.makedirs(exports_dir, exist_ok=True)
-            
-            filepath = os.path.join(exports_dir, filename)
-            
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
+            with open(filepath, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
                 if "appointments" in report_data:
                     # Appointment report
-                    fieldnames = ['appointment_id', 'patient_id', 'doctor_name', 
-                                'department', 'appointment_date', 'appointment_time', 'status']
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                    for appointment in report_data['appointments']:
-                        writer.writerow({k: appointment.get(k, '') for k in fieldnames})
+                    _write_csv_rows(csvfile, _APPOINTMENT_ROW_FIELDS, report_data['appointments'])
                 
                 elif "consultations" in report_data:
                     # OPD consultation report
-                    fieldnames = ['visit_id', 'patient_id', 'doctor_name', 'visit_date', 
-                                'symptoms', 'diagnosis', 'status']
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                    for visit in report_data['consultations']:
-                        writer.writerow({k: visit.get(k, '') for k in fieldnames})
+                    _write_csv_rows(csvfile, _VISIT_ROW_FIELDS, report_data['consultations'])
                 
                 else:
                     # Summary statistics
@@ -285,7 +397,7 @@ class ReportGenerator:
                     
                     # Write key statistics
                     for key, value in report_data.items():
-                        if key not in ['report_type', 'generated_at', 'date_range', 'appointments', 'consultations']:
+                        if key not in _SUMMARY_SKIP_KEYS:
                             if isinstance(value, dict):
                                 writer.writerow([key.replace('_', ' ').title()])
                                 for k, v in value.items():
@@ -298,45 +410,30 @@ class ReportGenerator:
             print(f"Error exporting to CSV: {e}")
             return False
     
+    @_versioned_lru_cache(include_today=True)
     def get_report_summary_stats(self) -> Dict[str, Any]:
         """Get overall summary statistics for dashboard"""
         patients = self.data_manager.get_patients()
-        appointments = self.data_manager.get_appointments()
-        opd_visits = self.data_manager.get_opd_visits()
-        
-        today = datetime.now().date()
-        
-        # Today's statistics
-        today_appointments = [appt for appt in appointments 
-                            if appt.appointment_date == today.strftime("%Y-%m-%d")]
-        
-        today_visits = []
-        for visit in opd_visits:
-            try:
-                visit_date = datetime.strptime(visit.visit_date, "%Y-%m-%d %H:%M:%S").date()
-                if visit_date == today:
-                    today_visits.append(visit)
-            except ValueError:
-                continue
-        
-        # This month's statistics
-        month_start = today.replace(day=1)
-        month_patients = []
-        for patient in patients:
-            try:
-                reg_date = datetime.strptime(patient.registration_date, "%Y-%m-%d %H:%M:%S").date()
-                if reg_date >= month_start:
-                    month_patients.append(patient)
-            except ValueError:
-                continue
+        self._rebuild_indices()
+        
+        today = date_cls.today()
+        today_key = today.isoformat()
+        
+        # Today's statistics, one status count per record list
+        today_appointments = self._appts_by_date.get(today_key, ())
+        today_visits = self._visits_by_date.get(today_key, ())
+        appointment_status = Counter(appt.status for appt in today_appointments)
+        visit_status = Counter(visit.status for visit in today_visits)
+        
+        # This month's statistics; registration timestamps sort as strings
+        month_key = today.replace(day=1).isoformat()
+        new_this_month = sum(1 for patient in patients if patient.registration_date >= month_key)
         
         return {
             "total_patients": len(patients),
-            "new_patients_this_month": len(month_patients),
+            "new_patients_this_month": new_this_month,
             "appointments_today": len(today_appointments),
             "consultations_today": len(today_visits),
-            "pending_appointments": len([appt for appt in today_appointments 
-                                       if appt.status == "Scheduled"]),
-            "completed_visits_today": len([visit for visit in today_visits 
-                                         if visit.status == "Completed"])
+            "pending_appointments": appointment_status.get("Scheduled", 0),
+            "completed_visits_today": visit_status.get("Completed", 0)
         }
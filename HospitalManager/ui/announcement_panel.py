@@ -3,30 +3,75 @@ Announcement Panel UI - Handles announcement system management and controls
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
-from datetime import datetime
-import threading
 import time
+from tkinter import ttk, messagebox
+from collections import deque
+from utils.debounce import debounce
+
+# Quick announcement presets: key -> (button text, message after the patient name, log label)
+ANNOUNCEMENT_PRESETS = {
+    'consultation_complete': (
+        "Consultation Complete",
+        "your consultation is complete. Please collect your prescription from the front desk.",
+        "Consultation complete"
+    ),
+    'prescription_ready': (
+        "Prescription Ready",
+        "your prescription is ready for collection at the pharmacy counter.",
+        "Prescription ready"
+    ),
+    'report_reception': (
+        "Report to Reception",
+        "please report to the reception desk for assistance.",
+        "Report to reception"
+    )
+}
 
 class AnnouncementPanelFrame:
     """Announcement panel interface for managing the announcement system"""
     
+    # Quick control buttons: (button text, handler method name)
+    _CONTROL_BUTTONS = (
+        ("Start System", 'start_announcement_system'),
+        ("Stop System", 'stop_announcement_system'),
+        ("Test Announcement", 'test_announcement_system'),
+        ("Refresh Status", 'refresh_status'),
+        ("Clear Log", 'clear_announcement_log')
+    )
+    
     def __init__(self, parent, data_manager, announcement_system):
         """Initialize announcement panel frame"""
         self.parent = parent
         self.data_manager = data_manager
         self.announcement_system = announcement_system
         self.is_monitoring = False
-        self.monitor_thread = None
+        self._tick_id = None  # Pending after() callback for the monitor tick
+        self._paused = False  # True while ticks are skipped because the panel is hidden
+        self._last_status = ()  # Status values last written to the status labels
+        self._pending_jobs = {}  # Debounced handler calls waiting on after()
+        self._log_stamp = ""  # Last formatted log timestamp and the second it was taken
+        self._log_stamp_second = None
+        self._last_queue_rows = ()  # Rows last shown in the queue listbox
+        self._last_completed_rows = ()  # Rows last shown in the completed listbox
+        self._todays_visits_cache = (0.0, None, None)  # (monotonic fetch time, data version, visits)
+        self._patient_names = None  # Patient ID to name map for the activity lists
+        self._patient_names_version = None
+        self._patient_options = ()  # Values currently set on the manual announcement combobox
+        self._patient_options_version = None
         
         self.create_widgets()
         self.start_monitoring()
     
     def create_widgets(self):
         """Create and layout widgets"""
-        # Main container
+        # Main container, packed only once all of its children exist so the
+        # whole panel is laid out and mapped in a single geometry pass
         main_frame = ttk.Frame(self.parent)
-        main_frame.pack(fill='both', expand=True, padx=5, pady=5)
+        
+        # Stop the monitor tick when the panel is torn down (e.g. switching modules)
+        self.main_frame = main_frame
+        main_frame.bind('<Destroy>', self._on_destroy)
+        main_frame.bind('<Visibility>', self._on_visibility)
         
         # Title
         title_label = ttk.Label(main_frame, text="Announcement System", style='Title.TLabel')
@@ -34,6 +79,8 @@ class AnnouncementPanelFrame:
         
         # Create main layout with three columns
         self.create_main_layout(main_frame)
+        
+        main_frame.pack(fill='both', expand=True, padx=5, pady=5)
     
     def create_main_layout(self, parent):
         """Create main layout with status, controls, and logs"""
@@ -116,16 +163,8 @@ class AnnouncementPanelFrame:
     
     def create_controls_section(self, parent):
         """Create quick controls section"""
-        controls = [
-            ("Start System", self.start_announcement_system, 'green'),
-            ("Stop System", self.stop_announcement_system, 'red'),
-            ("Test Announcement", self.test_announcement_system, 'blue'),
-            ("Refresh Status", self.refresh_status, 'orange'),
-            ("Clear Log", self.clear_announcement_log, 'gray')
-        ]
-        
-        for i, (text, command, color) in enumerate(controls):
-            btn = ttk.Button(parent, text=text, command=command)
+        for text, method_name in self._CONTROL_BUTTONS:
+            btn = ttk.Button(parent, text=text, command=getattr(self, method_name))
             btn.pack(fill='x', pady=2)
     
     def create_manual_announcement_section(self, parent):
@@ -148,15 +187,12 @@ class AnnouncementPanelFrame:
         
         ttk.Label(preset_frame, text="Quick Announcements:").pack(side='left', padx=(0, 5))
         
-        preset_buttons = [
-            ("Call Next Patient", self.call_next_patient),
-            ("Consultation Complete", self.announce_consultation_complete),
-            ("Prescription Ready", self.announce_prescription_ready),
-            ("Report to Reception", self.announce_report_reception)
-        ]
+        ttk.Button(preset_frame, text="Call Next Patient",
+                  command=self.call_next_patient).pack(side='left', padx=2)
         
-        for text, command in preset_buttons:
-            ttk.Button(preset_frame, text=text, command=command).pack(side='left', padx=2)
+        for preset_key, (text, _, _) in ANNOUNCEMENT_PRESETS.items():
+            ttk.Button(preset_frame, text=text,
+                      command=lambda key=preset_key: self.announce_preset(key)).pack(side='left', padx=2)
         
         # Custom announcement
         custom_frame = ttk.Frame(parent)
@@ -185,14 +221,17 @@ class AnnouncementPanelFrame:
     
     def create_log_section(self, parent):
         """Create announcement log section"""
-        # Log display
-        self.log_text = tk.Text(parent, wrap='word', height=12, font=('Courier', 9))
-        log_scrollbar = ttk.Scrollbar(parent, orient='vertical', command=self.log_text.yview)
-        self.log_text.configure(yscrollcommand=log_scrollbar.set)
+        # Log display (one row per entry, capped at the last 100 entries)
+        self.log_listbox = tk.Listbox(parent, height=12, font=('Courier', 9))
+        log_scrollbar = ttk.Scrollbar(parent, orient='vertical', command=self.log_listbox.yview)
+        self.log_listbox.configure(yscrollcommand=log_scrollbar.set)
         
-        self.log_text.pack(side='left', fill='both', expand=True)
+        self.log_listbox.pack(side='left', fill='both', expand=True)
         log_scrollbar.pack(side='right', fill='y')
         
+        # Backing store for the log rows, mirrors the listbox contents
+        self._log_entries = deque(maxlen=100)
+        
         # Add initial log entry
         self.add_log_entry("Announcement panel initialized")
     
@@ -228,57 +267,105 @@ class AnnouncementPanelFrame:
         """Start monitoring the announcement system"""
         if not self.is_monitoring:
             self.is_monitoring = True
-            self.monitor_thread = threading.Thread(target=self.monitor_loop, daemon=True)
-            self.monitor_thread.start()
+            self._tick_id = self.parent.after(5000, self._tick)
     
     def stop_monitoring(self):
         """Stop monitoring the announcement system"""
         self.is_monitoring = False
+        if self._tick_id is not None:
+            self.parent.after_cancel(self._tick_id)
+            self._tick_id = None
+    
+    def _tick(self):
+        """Refresh status and activity on the UI thread, then schedule the next tick"""
+        self._tick_id = None
+        if not self.is_monitoring:
+            return
+        
+        # Nothing to show while the panel is hidden (e.g. window minimized), check again shortly
+        if not self.main_frame.winfo_viewable():
+            self._paused = True
+            self._tick_id = self.parent.after(1000, self._tick)
+            return
+        self._paused = False
+        
+        delay = 5000  # Update every 5 seconds
+        try:
+            self.refresh_status()
+            self.refresh_activity()
+        except Exception as e:
+            print(f"Error in announcement monitor loop: {e}")
+            delay = 10000  # Wait longer on error
+        
+        self._tick_id = self.parent.after(delay, self._tick)
     
-    def monitor_loop(self):
-        """Main monitoring loop"""
-        while self.is_monitoring:
-            try:
-                self.refresh_status()
-                self.refresh_activity()
-                time.sleep(5)  # Update every 5 seconds
-            except Exception as e:
-                print(f"Error in announcement monitor loop: {e}")
-                time.sleep(10)  # Wait longer on error
+    def _on_visibility(self, event):
+        """Refresh straight away when the panel is shown again after ticks were skipped"""
+        if self._paused and self.is_monitoring:
+            if self._tick_id is not None:
+                self.parent.after_cancel(self._tick_id)
+            self._tick()
+    
+    def _on_destroy(self, event):
+        """Stop monitoring once the panel's main frame is destroyed"""
+        if event.widget is self.main_frame:
+            self.stop_monitoring()
+            for pending in self._pending_jobs.values():
+                self.parent.after_cancel(pending)
+            self._pending_jobs.clear()
     
     def refresh_status(self):
         """Refresh system status display"""
         try:
             if self.announcement_system:
                 status = self.announcement_system.get_announcement_status()
-                
-                # Update system status
-                if status['is_running']:
+                state = (status['is_running'], status['tts_available'],
+                         status['announced_today'], status['announcement_interval'])
+            else:
+                state = None
+            
+            # Nothing to redraw if the status is the same as last tick
+            previous = self._last_status
+            if state == previous:
+                return
+            self._last_status = state
+            
+            if state is None:
+                self.system_status_var.set("System Unavailable")
+                self.system_status_label.config(foreground='red')
+                self.tts_status_var.set("Unavailable")
+                self.tts_status_label.config(foreground='red')
+                return
+            
+            if not previous:
+                previous = (None, None, None, None)
+            is_running, tts_available, announced_today, interval = state
+            
+            # Update system status
+            if is_running != previous[0]:
+                if is_running:
                     self.system_status_var.set("Active")
                     self.system_status_label.config(foreground='green')
                 else:
                     self.system_status_var.set("Inactive")
                     self.system_status_label.config(foreground='red')
-                
-                # Update TTS status
-                if status['tts_available']:
+            
+            # Update TTS status
+            if tts_available != previous[1]:
+                if tts_available:
                     self.tts_status_var.set("Available")
                     self.tts_status_label.config(foreground='green')
                 else:
                     self.tts_status_var.set("Not Available")
                     self.tts_status_label.config(foreground='orange')
-                
-                # Update announcements today
-                self.announcements_today_var.set(str(status['announced_today']))
-                
-                # Update interval
-                self.interval_var.set(str(status['announcement_interval']))
-                
-            else:
-                self.system_status_var.set("System Unavailable")
-                self.system_status_label.config(foreground='red')
-                self.tts_status_var.set("Unavailable")
-                self.tts_status_label.config(foreground='red')
+            
+            # Update announcements today
+            if announced_today != previous[2]:
+                self.announcements_today_var.set(str(announced_today))
+            
+            # Update interval
+            if interval != previous[3]:
+                self.interval_var.set(str(interval))
                 
         except Exception as e:
             print(f"Error refreshing status: {e}")
@@ -286,58 +373,92 @@ class AnnouncementPanelFrame:
     def refresh_activity(self):
         """Refresh queue and activity displays"""
         try:
-            # Clear existing items
-            self.queue_listbox.delete(0, tk.END)
-            self.completed_listbox.delete(0, tk.END)
-            
             # Get today's OPD visits
-            today_visits = self.data_manager.get_todays_opd_visits()
+            today_visits = self._get_todays_visits()
+            patient_names = self._get_patient_names()
             
-            # Current queue (in progress visits)
-            in_progress_visits = [visit for visit in today_visits if visit.status == 'In Progress']
+            # Current queue (in progress visits) and completed visits, in one pass
+            queue_rows = []
+            completed_rows = []
+            add_queue_row = queue_rows.append
+            add_completed_row = completed_rows.append
             
-            for i, visit in enumerate(in_progress_visits):
-                patient = self.data_manager.get_patient_by_id(visit.patient_id)
-                patient_name = patient.name if patient else "Unknown Patient"
+            for visit in today_visits:
+                status = visit.status
+                if status != 'In Progress' and status != 'Completed':
+                    continue
+                
+                patient_name = patient_names.get(visit.patient_id, "Unknown Patient")
                 
                 try:
-                    visit_time = datetime.strptime(visit.visit_date, "%Y-%m-%d %H:%M:%S")
-                    time_str = visit_time.strftime("%H:%M")
+                    time_str = visit.get_datetime().strftime("%H:%M")
                 except ValueError:
                     time_str = "Unknown"
                 
-                self.queue_listbox.insert(tk.END, f"{i+1}. {patient_name} - {visit.doctor_name} ({time_str})")
+                if status == 'In Progress':
+                    add_queue_row(f"{len(queue_rows) + 1}. {patient_name} - {visit.doctor_name} ({time_str})")
+                else:
+                    add_completed_row(f"{patient_name} - {visit.doctor_name} ({time_str})")
             
-            if not in_progress_visits:
-                self.queue_listbox.insert(tk.END, "No patients in queue")
+            if not queue_rows:
+                add_queue_row("No patients in queue")
             
-            # Completed visits
-            completed_visits = [visit for visit in today_visits if visit.status == 'Completed']
+            if not completed_rows:
+                add_completed_row("No completed consultations today")
             
-            for visit in completed_visits:
-                patient = self.data_manager.get_patient_by_id(visit.patient_id)
-                patient_name = patient.name if patient else "Unknown Patient"
-                
-                try:
-                    visit_time = datetime.strptime(visit.visit_date, "%Y-%m-%d %H:%M:%S")
-                    time_str = visit_time.strftime("%H:%M")
-                except ValueError:
-                    time_str = "Unknown"
-                
-                self.completed_listbox.insert(tk.END, f"{patient_name} - {visit.doctor_name} ({time_str})")
+            # Only touch the listboxes whose contents actually changed
+            queue_rows = tuple(queue_rows)
+            if queue_rows != self._last_queue_rows:
+                self._replace_listbox_rows(self.queue_listbox, queue_rows, self._last_queue_rows)
+                self._last_queue_rows = queue_rows
             
-            if not completed_visits:
-                self.completed_listbox.insert(tk.END, "No completed consultations today")
+            completed_rows = tuple(completed_rows)
+            if completed_rows != self._last_completed_rows:
+                self._replace_listbox_rows(self.completed_listbox, completed_rows, self._last_completed_rows)
+                self._last_completed_rows = completed_rows
                 
         except Exception as e:
             print(f"Error refreshing activity: {e}")
     
+    def _get_todays_visits(self):
+        """Get today's OPD visits, reusing the last fetch for up to a second if no data was saved since"""
+        fetched_at, version, visits = self._todays_visits_cache
+        now = time.monotonic()
+        if visits is None or version != self.data_manager.version or now - fetched_at >= 1.0:
+            visits = self.data_manager.get_todays_opd_visits()
+            self._todays_visits_cache = (now, self.data_manager.version, visits)
+        return visits
+    
+    def _get_patient_names(self):
+        """Get a patient ID to name map, rebuilt only when the data has changed"""
+        if self._patient_names is None or self._patient_names_version != self.data_manager.patients_version:
+            self._patient_names = {patient.patient_id: patient.name
+                                   for patient in self.data_manager.get_patients()}
+            self._patient_names_version = self.data_manager.patients_version
+        return self._patient_names
+    
+    def _replace_listbox_rows(self, listbox, rows, previous_rows):
+        """Replace listbox items with rows using at most one delete and one insert call"""
+        # Lists such as completed consultations mostly grow at the end, so only send the new tail
+        kept = len(previous_rows)
+        if len(rows) > kept and rows[:kept] == previous_rows:
+            listbox.insert(tk.END, *rows[kept:])
+            return
+        
+        listbox.delete(0, tk.END)
+        listbox.insert(tk.END, *rows)
+    
     def refresh_patient_list(self):
         """Refresh patient list for manual announcements"""
         try:
+            # Patients unchanged since the last refresh, the combobox already holds them
+            if self._patient_options_version == self.data_manager.patients_version:
+                return
+            
             patients = self.data_manager.get_patients()
-            patient_options = [f"{p.patient_id} - {p.name}" for p in patients]
-            self.manual_patient_combo.config(values=patient_options)
+            self._patient_options = tuple(f"{p.patient_id} - {p.name}" for p in patients)
+            self._patient_options_version = self.data_manager.patients_version
+            self.manual_patient_combo.config(values=self._patient_options)
         except Exception as e:
             print(f"Error refreshing patient list: {e}")
     
@@ -390,6 +511,7 @@ class AnnouncementPanelFrame:
             self.add_log_entry(error_msg)
             messagebox.showerror("Error", error_msg)
     
+    @debounce()
     def update_interval(self):
         """Update announcement check interval"""
         try:
@@ -412,19 +534,18 @@ class AnnouncementPanelFrame:
             self.add_log_entry(error_msg)
             messagebox.showerror("Error", error_msg)
     
+    @debounce()
     def call_next_patient(self):
         """Call next patient in queue"""
         try:
-            # Get next patient from queue
-            today_visits = self.data_manager.get_todays_opd_visits()
-            in_progress_visits = [visit for visit in today_visits if visit.status == 'In Progress']
+            # Get first patient from queue
+            next_visit = next((visit for visit in self._get_todays_visits()
+                               if visit.status == 'In Progress'), None)
             
-            if not in_progress_visits:
+            if next_visit is None:
                 messagebox.showinfo("Queue", "No patients in queue")
                 return
             
-            # Get first patient
-            next_visit = in_progress_visits[0]
             patient = self.data_manager.get_patient_by_id(next_visit.patient_id)
             
             if patient and self.announcement_system:
@@ -440,60 +561,10 @@ class AnnouncementPanelFrame:
             self.add_log_entry(error_msg)
             messagebox.showerror("Error", error_msg)
     
-    def announce_consultation_complete(self):
-        """Announce consultation complete for selected patient"""
-        patient_selection = self.manual_patient_var.get().strip()
-        
-        if not patient_selection:
-            messagebox.showwarning("Warning", "Please select a patient")
-            return
-        
-        try:
-            patient_id = patient_selection.split(' - ')[0]
-            patient = self.data_manager.get_patient_by_id(patient_id)
-            
-            if patient and self.announcement_system:
-                message = f"Patient {patient.name}, your consultation is complete. Please collect your prescription from the front desk."
-                self.announcement_system.add_manual_announcement(patient.name, message)
-                self.add_log_entry(f"Consultation complete announcement: {patient.name}")
-                self.last_announcement_var.set(f"Consultation complete: {patient.name}")
-                messagebox.showinfo("Announcement", f"Announced consultation complete for {patient.name}")
-            else:
-                messagebox.showerror("Error", "Patient not found or announcement system unavailable")
-                
-        except Exception as e:
-            error_msg = f"Error making consultation complete announcement: {str(e)}"
-            self.add_log_entry(error_msg)
-            messagebox.showerror("Error", error_msg)
-    
-    def announce_prescription_ready(self):
-        """Announce prescription ready for selected patient"""
-        patient_selection = self.manual_patient_var.get().strip()
-        
-        if not patient_selection:
-            messagebox.showwarning("Warning", "Please select a patient")
-            return
-        
-        try:
-            patient_id = patient_selection.split(' - ')[0]
-            patient = self.data_manager.get_patient_by_id(patient_id)
-            
-            if patient and self.announcement_system:
-                message = f"Patient {patient.name}, your prescription is ready for collection at the pharmacy counter."
-                self.announcement_system.add_manual_announcement(patient.name, message)
-                self.add_log_entry(f"Prescription ready announcement: {patient.name}")
-                self.last_announcement_var.set(f"Prescription ready: {patient.name}")
-                messagebox.showinfo("Announcement", f"Announced prescription ready for {patient.name}")
-            else:
-                messagebox.showerror("Error", "Patient not found or announcement system unavailable")
-                
-        except Exception as e:
-            error_msg = f"Error making prescription ready announcement: {str(e)}"
-            self.add_log_entry(error_msg)
-            messagebox.showerror("Error", error_msg)
-    
-    def announce_report_reception(self):
-        """Announce patient to report to reception"""
+    @debounce()
+    def announce_preset(self, preset_key):
+        """Make a pre-defined announcement for the selected patient"""
+        _, message_text, label = ANNOUNCEMENT_PRESETS[preset_key]
         patient_selection = self.manual_patient_var.get().strip()
         
         if not patient_selection:
@@ -505,19 +576,20 @@ class AnnouncementPanelFrame:
             patient = self.data_manager.get_patient_by_id(patient_id)
             
             if patient and self.announcement_system:
-                message = f"Patient {patient.name}, please report to the reception desk for assistance."
+                message = f"Patient {patient.name}, {message_text}"
                 self.announcement_system.add_manual_announcement(patient.name, message)
-                self.add_log_entry(f"Report to reception announcement: {patient.name}")
-                self.last_announcement_var.set(f"Report to reception: {patient.name}")
-                messagebox.showinfo("Announcement", f"Announced report to reception for {patient.name}")
+                self.add_log_entry(f"{label} announcement: {patient.name}")
+                self.last_announcement_var.set(f"{label}: {patient.name}")
+                messagebox.showinfo("Announcement", f"Announced {label.lower()} for {patient.name}")
             else:
                 messagebox.showerror("Error", "Patient not found or announcement system unavailable")
                 
         except Exception as e:
-            error_msg = f"Error making report to reception announcement: {str(e)}"
+            error_msg = f"Error making {label.lower()} announcement: {str(e)}"
             self.add_log_entry(error_msg)
             messagebox.showerror("Error", error_msg)
     
+    @debounce()
     def make_custom_announcement(self):
         """Make custom announcement"""
         patient_selection = self.manual_patient_var.get().strip()
@@ -556,24 +628,27 @@ class AnnouncementPanelFrame:
         """Clear the announcement log"""
         result = messagebox.askyesno("Clear Log", "Clear the announcement log?")
         if result:
-            self.log_text.delete('1.0', tk.END)
+            self.log_listbox.delete(0, tk.END)
+            self._log_entries.clear()
             self.add_log_entry("Announcement log cleared")
     
     def add_log_entry(self, message):
         """Add entry to announcement log"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
-        
-        self.log_text.insert(tk.END, log_entry)
-        self.log_text.see(tk.END)
-        self.log_text.update()
-        
-        # Keep log size manageable (last 100 lines)
-        lines = self.log_text.get('1.0', tk.END).count('\n')
-        if lines > 100:
-            # Remove first 20 lines
-            for _ in range(20):
-                self.log_text.delete('1.0', '2.0')
+        # Burst logging reuses the formatted timestamp for entries within the same second
+        now_seconds = int(time.time())
+        if now_seconds != self._log_stamp_second:
+            self._log_stamp = time.strftime("%H:%M:%S")
+            self._log_stamp_second = now_seconds
+        timestamp = self._log_stamp
+        log_entry = f"[{timestamp}] {message}"
+        
+        # Keep log size manageable (last 100 lines); the deque drops its oldest row itself
+        if len(self._log_entries) == self._log_entries.maxlen:
+            self.log_listbox.delete(0)
+        self._log_entries.append(log_entry)
+        
+        self.log_listbox.insert(tk.END, log_entry)
+        self.log_listbox.see(tk.END)
     
     def refresh(self):
         """Refresh all announcement panel data"""
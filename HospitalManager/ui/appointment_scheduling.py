@@ -3,23 +3,100 @@ Appointment Scheduling UI - Handles appointment booking, management, and calenda
 """
 
 import tkinter as tk
+import threading
+import queue
 from tkinter import ttk, messagebox
 from datetime import datetime, timedelta
-from models.appointment import Appointment, DoctorSchedule
+from collections import defaultdict
+from models.appointment import Appointment, DoctorSchedule, BOOKED_STATUSES
+from utils.date_utils import parse_ymd
+from utils.debounce import debounce
 import calendar
 
+# Doctor choices for the comboboxes, built once since the doctor list is fixed
+_DOCTOR_NAMES = DoctorSchedule.get_doctor_names()
+_DOCTOR_FILTER_OPTIONS = ('All',) + _DOCTOR_NAMES
+
+# Status choices shared by the form and the list filter
+_STATUS_OPTIONS = ('Scheduled', 'Completed', 'Cancelled', 'No-Show')
+_STATUS_FILTER_OPTIONS = ('All',) + _STATUS_OPTIONS
+
+# Appointment list rows inserted or updated per event loop pass
+_LIST_BATCH_SIZE = 200
+
+def _build_appointment_rows(appointments, patient_names, notes_previews):
+    """Build list rows from a snapshot of appointments (runs on the list worker thread)
+    
+    notes_previews is only read; previews missing from it are returned in a new dict
+    so the UI thread can add them to its memo.
+    """
+    new_previews = {}
+    rows = []
+    for appointment in appointments:
+        # Get patient name
+        patient_name = patient_names.get(appointment.patient_id, "Unknown Patient")
+        
+        # Truncate notes for display
+        notes_display = appointment.notes
+        if len(notes_display) > 30:
+            preview = notes_previews.get(notes_display) or new_previews.get(notes_display)
+            if preview is None:
+                preview = new_previews[notes_display] = notes_display[:30] + "..."
+            notes_display = preview
+        
+        rows.append((
+            appointment.appointment_id,
+            patient_name,
+            appointment.doctor_name,
+            appointment.department,
+            appointment.appointment_date,
+            appointment.appointment_time,
+            appointment.status,
+            notes_display
+        ))
+    return rows, new_previews
+
 class AppointmentSchedulingFrame:
     """Appointment scheduling interface"""
     
+    # Notebook tabs in display order: (key, tab text, builder method name)
+    _TABS = (
+        ('calendar', "Calendar View", 'create_calendar_tab'),
+        ('form', "Book Appointment", 'create_appointment_form_tab'),
+        ('list', "Appointment List", 'create_appointment_list_tab'),
+        ('schedule', "Doctor Schedules", 'create_doctor_schedule_tab'),
+    )
+    
     def __init__(self, parent, data_manager):
         """Initialize appointment scheduling frame"""
         self.parent = parent
         self.data_manager = data_manager
         self.current_appointment = None
         self.selected_date = datetime.now().date()
+        self._display_year = self.selected_date.year  # Month shown in the calendar view
+        self._display_month = self.selected_date.month
+        self._month_appointments = (None, None, {})  # ((year, month), data version, {date: [appointments]})
+        self._pending_jobs = {}  # Debounced callbacks waiting on after(), keyed by purpose
+        self._invalid_views = set()  # Views waiting for a coalesced refresh
+        
+        # Appointment list rows are built by one worker thread from snapshots taken on the
+        # UI thread; requests and results travel through these queues
+        self._list_requests = queue.Queue()
+        self._list_results = queue.Queue()
+        self._list_request = 0  # Number of the most recent list load
+        self._list_worker = threading.Thread(target=self._run_list_worker, daemon=True)
+        self._list_worker.start()
+        self._tree_rows = {}  # appointment_id -> values currently shown in the list (the row's iid)
+        
+        # Patient combobox options mapped to patient IDs, and the patients version they reflect
+        self._patient_ids_by_option = {}
+        self._patient_options_version = None
+        self._patient_names = (None, {})  # (patients version, {patient_id: name})
+        self._notes_previews = (None, {})  # (data version, {long notes: truncated notes})
+        self._doctor_panels = None  # doctor name -> schedule overview widgets, built on first refresh
+        self._last_calendar_render = None  # (month, today, [(text, state, bg) per cell]) last drawn
         
         self.create_widgets()
-        self.refresh_appointments()
     
     def create_widgets(self):
         """Create and layout widgets"""
@@ -27,6 +104,10 @@ class AppointmentSchedulingFrame:
         main_frame = ttk.Frame(self.parent)
         main_frame.pack(fill='both', expand=True, padx=5, pady=5)
         
+        # Drop pending debounced callbacks when the module is closed
+        self.main_frame = main_frame
+        main_frame.bind('<Destroy>', self._on_destroy)
+        
         # Title
         title_label = ttk.Label(main_frame, text="Appointment Scheduling", style='Title.TLabel')
         title_label.pack(pady=(0, 10))
@@ -35,16 +116,36 @@ class AppointmentSchedulingFrame:
         self.notebook = ttk.Notebook(main_frame)
         self.notebook.pack(fill='both', expand=True)
         
-        # Create tabs
-        self.create_calendar_tab()
-        self.create_appointment_form_tab()
-        self.create_appointment_list_tab()
-        self.create_doctor_schedule_tab()
+        # Add an empty frame per tab; contents are built the first time a tab is shown
+        self._tab_frames = {}
+        self._built_tabs = set()
+        for key, text, _builder in self._TABS:
+            tab_frame = ttk.Frame(self.notebook)
+            self.notebook.add(tab_frame, text=text)
+            self._tab_frames[key] = tab_frame
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        
+        self._ensure_tab('calendar')
+    
+    def _ensure_tab(self, key):
+        """Build the contents of a tab if it has not been built yet"""
+        if key in self._built_tabs:
+            return
+        self._built_tabs.add(key)
+        builder = next(builder for tab_key, _text, builder in self._TABS if tab_key == key)
+        getattr(self, builder)(self._tab_frames[key])
     
-    def create_calendar_tab(self):
+    def _on_tab_changed(self, event=None):
+        """Build the newly selected tab on first selection"""
+        self._ensure_tab(self._TABS[self.notebook.index('current')][0])
+    
+    def _show_tab(self, key):
+        """Build a tab if needed and switch to it"""
+        self._ensure_tab(key)
+        self.notebook.select(self._tab_frames[key])
+    
+    def create_calendar_tab(self, calendar_frame):
         """Create calendar view tab"""
-        calendar_frame = ttk.Frame(self.notebook)
-        self.notebook.add(calendar_frame, text="Calendar View")
         
         # Calendar controls
         control_frame = ttk.Frame(calendar_frame)
@@ -67,9 +168,8 @@ class AppointmentSchedulingFrame:
         
         ttk.Label(filter_frame, text="Filter by Doctor:").pack(side='left', padx=(0, 5))
         self.calendar_doctor_var = tk.StringVar()
-        doctor_names = ['All'] + [doc['name'] for doc in DoctorSchedule.get_doctors()]
         doctor_filter = ttk.Combobox(filter_frame, textvariable=self.calendar_doctor_var,
-                                   values=doctor_names, width=15, state='readonly')
+                                   values=_DOCTOR_FILTER_OPTIONS, width=15, state='readonly')
         doctor_filter.set('All')
         doctor_filter.pack(side='left', padx=(0, 5))
         doctor_filter.bind('<<ComboboxSelected>>', self.refresh_calendar)
@@ -95,6 +195,12 @@ class AppointmentSchedulingFrame:
         self.date_appointments_frame = ttk.Frame(info_frame)
         self.date_appointments_frame.pack(fill='both', expand=True, pady=(10, 0))
         
+        # Two labels reused across date selections: a header and one multi-line appointment list
+        self._date_info_header = ttk.Label(self.date_appointments_frame, text="")
+        self._date_info_header.pack(anchor='w')
+        self._date_appt_label = ttk.Label(self.date_appointments_frame, text="", justify='left')
+        self._date_appt_label.pack(anchor='w')
+        
         # Update calendar
         self.update_calendar_display()
     
@@ -110,14 +216,16 @@ class AppointmentSchedulingFrame:
             label = ttk.Label(self.calendar_grid_frame, text=day, style='Heading.TLabel')
             label.grid(row=0, column=i, padx=1, pady=1, sticky='nsew')
         
-        # Calendar day buttons
+        # Calendar day buttons, also kept in row-major order for rendering by cell index
         self.day_buttons = {}
+        self._day_buttons_flat = []
         for week in range(6):  # Max 6 weeks in a month view
             for day in range(7):
                 btn = tk.Button(self.calendar_grid_frame, text="", width=8, height=4,
                               command=lambda w=week, d=day: self.select_calendar_date(w, d))
                 btn.grid(row=week+1, column=day, padx=1, pady=1, sticky='nsew')
                 self.day_buttons[(week, day)] = btn
+                self._day_buttons_flat.append(btn)
         
         # Configure grid weights
         for i in range(7):
@@ -125,10 +233,8 @@ class AppointmentSchedulingFrame:
         for i in range(7):
             self.calendar_grid_frame.rowconfigure(i, weight=1)
     
-    def create_appointment_form_tab(self):
+    def create_appointment_form_tab(self, form_frame):
         """Create appointment form tab"""
-        form_frame = ttk.Frame(self.notebook)
-        self.notebook.add(form_frame, text="Book Appointment")
         
         # Form container
         form_container = ttk.LabelFrame(form_frame, text="Appointment Details", padding="10")
@@ -158,7 +264,7 @@ class AppointmentSchedulingFrame:
         ttk.Label(form_container, text="Doctor:*").grid(row=2, column=0, sticky='w', pady=5)
         self.doctor_var = tk.StringVar()
         doctor_combo = ttk.Combobox(form_container, textvariable=self.doctor_var,
-                                  values=[doc['name'] for doc in DoctorSchedule.get_doctors()],
+                                  values=_DOCTOR_NAMES,
                                   width=25, state='readonly')
         doctor_combo.grid(row=2, column=1, sticky='w', pady=5, padx=(10, 0))
         doctor_combo.bind('<<ComboboxSelected>>', self.on_doctor_selected)
@@ -178,7 +284,7 @@ class AppointmentSchedulingFrame:
         self.date_var = tk.StringVar()
         date_entry = ttk.Entry(date_frame, textvariable=self.date_var, width=12)
         date_entry.pack(side='left')
-        date_entry.bind('<KeyRelease>', self.on_date_changed)
+        date_entry.bind('<KeyRelease>', lambda e: self.on_date_typed())
         
         ttk.Label(date_frame, text="(YYYY-MM-DD)").pack(side='left', padx=(5, 0))
         
@@ -193,7 +299,7 @@ class AppointmentSchedulingFrame:
         ttk.Label(form_container, text="Status:").grid(row=6, column=0, sticky='w', pady=5)
         self.status_var = tk.StringVar()
         status_combo = ttk.Combobox(form_container, textvariable=self.status_var,
-                                  values=['Scheduled', 'Completed', 'Cancelled', 'No-Show'],
+                                  values=_STATUS_OPTIONS,
                                   width=15, state='readonly')
         status_combo.set('Scheduled')
         status_combo.grid(row=6, column=1, sticky='w', pady=5, padx=(10, 0))
@@ -223,11 +329,15 @@ class AppointmentSchedulingFrame:
         # Initialize form
         self.refresh_patient_list()
         self.clear_appointment_form()
+        
+        # Carry over a date picked on the calendar before the form was first shown
+        selected = self.selected_date.isoformat()
+        if self.date_var.get() != selected:
+            self.date_var.set(selected)
+            self.on_date_changed()
     
-    def create_appointment_list_tab(self):
+    def create_appointment_list_tab(self, list_frame):
         """Create appointment list tab"""
-        list_frame = ttk.Frame(self.notebook)
-        self.notebook.add(list_frame, text="Appointment List")
         
         # Control frame
         control_frame = ttk.Frame(list_frame)
@@ -253,26 +363,26 @@ class AppointmentSchedulingFrame:
         ttk.Label(filter_frame, text="Doctor:").pack(side='left', padx=(0, 5))
         self.list_doctor_var = tk.StringVar()
         doctor_filter = ttk.Combobox(filter_frame, textvariable=self.list_doctor_var,
-                                   values=['All'] + [doc['name'] for doc in DoctorSchedule.get_doctors()],
+                                   values=_DOCTOR_FILTER_OPTIONS,
                                    width=15, state='readonly')
         doctor_filter.set('All')
         doctor_filter.pack(side='left', padx=(0, 10))
-        doctor_filter.bind('<<ComboboxSelected>>', self.filter_appointments)
+        doctor_filter.bind('<<ComboboxSelected>>', lambda e: self.filter_appointments())
         
         ttk.Label(filter_frame, text="Status:").pack(side='left', padx=(0, 5))
         self.list_status_var = tk.StringVar()
         status_filter = ttk.Combobox(filter_frame, textvariable=self.list_status_var,
-                                   values=['All', 'Scheduled', 'Completed', 'Cancelled', 'No-Show'],
+                                   values=_STATUS_FILTER_OPTIONS,
                                    width=12, state='readonly')
         status_filter.set('All')
         status_filter.pack(side='left', padx=(0, 10))
-        status_filter.bind('<<ComboboxSelected>>', self.filter_appointments)
+        status_filter.bind('<<ComboboxSelected>>', lambda e: self.filter_appointments())
         
         ttk.Label(filter_frame, text="Date:").pack(side='left', padx=(0, 5))
         self.list_date_var = tk.StringVar()
         date_filter = ttk.Entry(filter_frame, textvariable=self.list_date_var, width=12)
         date_filter.pack(side='left', padx=(0, 5))
-        date_filter.bind('<KeyRelease>', self.filter_appointments)
+        date_filter.bind('<KeyRelease>', lambda e: self.filter_appointments())
         
         ttk.Button(filter_frame, text="Clear Filters", 
                   command=self.clear_filters).pack(side='left', padx=(10, 0))
@@ -317,11 +427,12 @@ class AppointmentSchedulingFrame:
         
         # Bind double-click event
         self.appointment_tree.bind('<Double-1>', lambda e: self.edit_appointment())
+        
+        # Initial list load
+        self.refresh_appointments()
     
-    def create_doctor_schedule_tab(self):
+    def create_doctor_schedule_tab(self, schedule_frame):
         """Create doctor schedule overview tab"""
-        schedule_frame = ttk.Frame(self.notebook)
-        self.notebook.add(schedule_frame, text="Doctor Schedules")
         
         # Title
         ttk.Label(schedule_frame, text="Doctor Availability Overview", 
@@ -346,45 +457,102 @@ class AppointmentSchedulingFrame:
         # Initial schedule load
         self.refresh_doctor_schedules()
     
+    def invalidate(self, *views):
+        """Mark views ('list', 'calendar') for one refresh on the next idle pass"""
+        self._invalid_views.update(views)
+        if 'invalidate' not in self._pending_jobs:
+            self._pending_jobs['invalidate'] = self.parent.after_idle(self._flush_invalidations)
+    
+    def invalidate_after_change(self, *dates):
+        """Invalidate the views affected by changes to appointments on the given dates"""
+        self.invalidate('list')
+        
+        # The calendar only shows the displayed month and the selected date's appointments
+        shown_months = {f"{self._display_year:04d}-{self._display_month:02d}"}
+        if self.selected_date:
+            shown_months.add(f"{self.selected_date.year:04d}-{self.selected_date.month:02d}")
+        if any(date_str[:7] in shown_months for date_str in dates):
+            self.invalidate('calendar')
+    
+    def _flush_invalidations(self):
+        """Refresh each invalidated view once"""
+        del self._pending_jobs['invalidate']
+        views = self._invalid_views
+        self._invalid_views = set()
+        
+        if 'list' in views:
+            self.refresh_appointments()
+        if 'calendar' in views:
+            self.refresh_calendar()
+    
+    def _on_destroy(self, event):
+        """Cancel pending debounced callbacks and stop the list worker once the main frame is destroyed"""
+        if event.widget is self.main_frame:
+            self._list_requests.put(None)
+            for pending in self._pending_jobs.values():
+                self.parent.after_cancel(pending)
+            self._pending_jobs.clear()
+    
     def update_calendar_display(self):
         """Update calendar display"""
-        now = datetime.now()
-        display_date = datetime(now.year, now.month, 1)
-        
-        # Update calendar label
-        self.calendar_label.config(text=display_date.strftime("%B %Y"))
+        today = datetime.now().date()
+        display_date = datetime(self._display_year, self._display_month, 1)
+        is_current_month = (display_date.year == today.year and display_date.month == today.month)
+        
+        # Get calendar data: weekday of the 1st (Monday = 0) and number of days
+        first_weekday, days_in_month = calendar.monthrange(display_date.year, display_date.month)
+        month_appointments = self.get_month_appointments(display_date.year, display_date.month)
+        month_prefix = f"{display_date.year:04d}-{display_date.month:02d}-"
+        first_day = display_date.date()
+        doctor_filter = self.calendar_doctor_var.get()
+        if doctor_filter == 'All':
+            doctor_filter = ''
+        
+        # Work out each button's final (text, state, bg) before touching any widget
+        cells = [("", 'disabled', 'lightgray')] * len(self._day_buttons_flat)
+        dates = [None] * len(self._day_buttons_flat)
+        for day in range(1, days_in_month + 1):
+            # Row-major cell index follows directly from the day's offset from the first weekday
+            cell = first_weekday + day - 1
+            
+            appointments = month_appointments.get(f"{month_prefix}{day:02d}", ())
+            if doctor_filter:
+                has_appointments = any(appt.doctor_name == doctor_filter for appt in appointments)
+            else:
+                has_appointments = bool(appointments)
+            
+            # Appointments take priority over the today highlight
+            if has_appointments:
+                bg = 'lightgreen'
+            elif is_current_month and day == today.day:
+                bg = 'lightblue'
+            else:
+                bg = 'white'
+            
+            cells[cell] = (str(day), 'normal', bg)
+            dates[cell] = first_day.replace(day=day)
         
-        # Get calendar data
-        cal = calendar.monthcalendar(display_date.year, display_date.month)
+        render = (display_date, today, cells)
+        previous = self._last_calendar_render
+        if render == previous:
+            return
         
-        # Clear all buttons
-        for (week, day), btn in self.day_buttons.items():
-            btn.config(text="", state='disabled', bg='lightgray')
+        # Update calendar label
+        if previous is None or previous[0] != display_date:
+            self.calendar_label.config(text=display_date.strftime("%B %Y"))
+        
+        # One config call per button, and only for buttons whose look changed
+        previous_cells = previous[2] if previous else [None] * len(cells)
+        for btn, cell, previous_cell, cell_date in zip(self._day_buttons_flat, cells, previous_cells, dates):
+            if cell != previous_cell:
+                text, state, bg = cell
+                btn.config(text=text, state=state, bg=bg)
+            
+            # Store date for button
+            if cell_date is not None:
+                btn.date = cell_date
         
-        # Fill calendar
-        for week_num, week in enumerate(cal):
-            for day_num, day in enumerate(week):
-                if day == 0:
-                    continue
-                
-                btn = self.day_buttons[(week_num, day_num)]
-                btn.config(text=str(day), state='normal', bg='white')
-                
-                # Highlight today
-                if (display_date.year == now.year and 
-                    display_date.month == now.month and 
-                    day == now.day):
-                    btn.config(bg='lightblue')
-                
-                # Check for appointments on this day
-                check_date = datetime(display_date.year, display_date.month, day).date()
-                appointments = self.get_appointments_for_date(check_date)
-                
-                if appointments:
-                    btn.config(bg='lightgreen')
-                
-                # Store date for button
-                btn.date = check_date
+        self._last_calendar_render = render
     
     def select_calendar_date(self, week, day):
         """Handle calendar date selection"""
@@ -393,9 +561,10 @@ class AppointmentSchedulingFrame:
             self.selected_date = btn.date
             self.update_selected_date_info()
             
-            # Set date in appointment form
-            self.date_var.set(self.selected_date.strftime("%Y-%m-%d"))
-            self.on_date_changed()
+            # Set date in appointment form, if it has been built
+            if 'form' in self._built_tabs:
+                self.date_var.set(self.selected_date.isoformat())
+                self.on_date_changed()
     
     def update_selected_date_info(self):
         """Update selected date information"""
@@ -404,31 +573,37 @@ class AppointmentSchedulingFrame:
                 text=f"Selected Date: {self.selected_date.strftime('%A, %B %d, %Y')}"
             )
             
-            # Clear previous appointment info
-            for widget in self.date_appointments_frame.winfo_children():
-                widget.destroy()
-            
             # Get appointments for selected date
             appointments = self.get_appointments_for_date(self.selected_date)
             
             if appointments:
-                ttk.Label(self.date_appointments_frame, 
-                         text=f"Appointments for this date ({len(appointments)}):").pack(anchor='w')
-                
+                self._date_info_header.config(text=f"Appointments for this date ({len(appointments)}):")
+                patients = self.data_manager.get_patients_by_ids(appt.patient_id for appt in appointments)
+                lines = []
                 for appt in appointments:
-                    patient = self.data_manager.get_patient_by_id(appt.patient_id)
+                    patient = patients.get(appt.patient_id)
                     patient_name = patient.name if patient else "Unknown Patient"
-                    
-                    appt_text = f"• {appt.appointment_time} - {patient_name} with {appt.doctor_name} ({appt.status})"
-                    ttk.Label(self.date_appointments_frame, text=appt_text).pack(anchor='w')
+                    lines.append(f"• {appt.appointment_time} - {patient_name} with {appt.doctor_name} ({appt.status})")
+                self._date_appt_label.config(text="\n".join(lines))
             else:
-                ttk.Label(self.date_appointments_frame, 
-                         text="No appointments for this date").pack(anchor='w')
+                self._date_info_header.config(text="No appointments for this date")
+                self._date_appt_label.config(text="")
+    
+    def get_month_appointments(self, year, month):
+        """Get a month's appointments grouped by date, cached until the data changes"""
+        month_key, version, by_date = self._month_appointments
+        if month_key != (year, month) or version != self.data_manager.version:
+            by_date = defaultdict(list)
+            for appt in self.data_manager.get_appointments_by_month(year, month):
+                by_date[appt.appointment_date].append(appt)
+            by_date = dict(by_date)
+            self._month_appointments = ((year, month), self.data_manager.version, by_date)
+        return by_date
     
     def get_appointments_for_date(self, date):
         """Get appointments for a specific date"""
-        date_str = date.strftime("%Y-%m-%d")
-        appointments = self.data_manager.get_appointments_by_date(date_str)
+        date_str = date.isoformat()
+        appointments = self.get_month_appointments(date.year, date.month).get(date_str, [])
         
         # Apply doctor filter if set
         doctor_filter = self.calendar_doctor_var.get()
@@ -439,29 +614,29 @@ class AppointmentSchedulingFrame:
     
     def previous_month(self):
         """Navigate to previous month"""
-        current = datetime.now()
-        if current.month == 1:
-            new_date = current.replace(year=current.year-1, month=12)
+        if self._display_month == 1:
+            self._display_year -= 1
+            self._display_month = 12
         else:
-            new_date = current.replace(month=current.month-1)
+            self._display_month -= 1
         
-        # Update display (simplified for this implementation)
         self.update_calendar_display()
     
     def next_month(self):
         """Navigate to next month"""
-        current = datetime.now()
-        if current.month == 12:
-            new_date = current.replace(year=current.year+1, month=1)
+        if self._display_month == 12:
+            self._display_year += 1
+            self._display_month = 1
         else:
-            new_date = current.replace(month=current.month+1)
+            self._display_month += 1
         
-        # Update display (simplified for this implementation)
         self.update_calendar_display()
     
     def goto_today(self):
         """Navigate to today"""
         self.selected_date = datetime.now().date()
+        self._display_year = self.selected_date.year
+        self._display_month = self.selected_date.month
         self.update_calendar_display()
         self.update_selected_date_info()
     
@@ -472,19 +647,21 @@ class AppointmentSchedulingFrame:
     
     def refresh_patient_list(self):
         """Refresh patient list in combobox"""
+        # Patients unchanged since the last refresh, the combobox already holds them
+        if self._patient_options_version == self.data_manager.patients_version:
+            return
+        
         patients = self.data_manager.get_patients()
-        patient_options = [f"{p.patient_id} - {p.name}" for p in patients]
-        self.patient_combo.config(values=patient_options)
+        self._patient_ids_by_option = {f"{p.patient_id} - {p.name}": p.patient_id for p in patients}
+        self._patient_options_version = self.data_manager.patients_version
+        self.patient_combo.config(values=tuple(self._patient_ids_by_option))
     
     def on_doctor_selected(self, event=None):
         """Handle doctor selection"""
         doctor_name = self.doctor_var.get()
         
         # Auto-fill department
-        for doctor in DoctorSchedule.get_doctors():
-            if doctor['name'] == doctor_name:
-                self.department_var.set(doctor['department'])
-                break
+        self.department_var.set(DoctorSchedule.get_department(doctor_name))
         
         # Update available time slots
         self.update_available_slots()
@@ -493,6 +670,11 @@ class AppointmentSchedulingFrame:
         """Handle date change"""
         self.update_available_slots()
     
+    @debounce()
+    def on_date_typed(self):
+        """Handle typing in the date entry once it pauses"""
+        self.on_date_changed()
+    
     def update_available_slots(self):
         """Update available time slots based on doctor and date"""
         doctor_name = self.doctor_var.get()
@@ -504,14 +686,11 @@ class AppointmentSchedulingFrame:
         
         try:
             # Validate date
-            datetime.strptime(date_str, "%Y-%m-%d")
-            
-            # Get existing appointments
-            existing_appointments = self.data_manager.get_appointments()
+            parse_ymd(date_str)
             
             # Get available slots
             available_slots = DoctorSchedule.get_available_slots(
-                doctor_name, date_str, existing_appointments
+                doctor_name, date_str, self.data_manager.get_appointment_index()
             )
             
             self.time_combo.config(values=available_slots)
@@ -527,8 +706,8 @@ class AppointmentSchedulingFrame:
     def new_appointment(self):
         """Start creating a new appointment"""
         self.current_appointment = None
+        self._show_tab('form')
         self.clear_appointment_form()
-        self.notebook.select(1)  # Switch to form tab
         
         # Generate new appointment ID
         new_appointment = Appointment()
@@ -567,12 +746,15 @@ class AppointmentSchedulingFrame:
                 messagebox.showerror("Validation Error", "Please select a patient.")
                 return
             
-            patient_id = patient_selection.split(' - ')[0]
+            patient_id = self._patient_ids_by_option.get(patient_selection)
+            if patient_id is None:
+                patient_id = patient_selection.split(' - ')[0]
             
             # Create or update appointment
             if self.current_appointment:
-                # Update existing appointment
+                # Update existing appointment, remembering the date it is moving from
                 appointment = self.current_appointment
+                previous_date = appointment.appointment_date
                 appointment.patient_id = patient_id
                 appointment.doctor_name = doctor_name
                 appointment.department = department
@@ -582,6 +764,7 @@ class AppointmentSchedulingFrame:
                 appointment.notes = notes
             else:
                 # Create new appointment
+                previous_date = date_str
                 appointment = Appointment(
                     appointment_id=appointment_id,
                     patient_id=patient_id,
@@ -600,25 +783,22 @@ class AppointmentSchedulingFrame:
                 return
             
             # Check for conflicts
-            existing_appointments = self.data_manager.get_appointments()
-            for existing in existing_appointments:
-                if (existing.appointment_id != appointment.appointment_id and
-                    existing.doctor_name == appointment.doctor_name and
-                    existing.appointment_date == appointment.appointment_date and
-                    existing.appointment_time == appointment.appointment_time and
-                    existing.status in ['Scheduled', 'Completed']):
-                    messagebox.showerror("Conflict", 
-                                       f"Doctor {doctor_name} already has an appointment at {time_str} on {date_str}")
-                    return
+            conflict_id = self.data_manager.get_appointment_index().find_booking(
+                appointment.doctor_name, appointment.appointment_date,
+                appointment.appointment_time, exclude_id=appointment.appointment_id
+            )
+            if conflict_id is not None:
+                messagebox.showerror("Conflict", 
+                                   f"Doctor {doctor_name} already has an appointment at {time_str} on {date_str}")
+                return
             
             # Save appointment
             success = self.data_manager.save_appointment(appointment)
             if success:
                 messagebox.showinfo("Success", "Appointment saved successfully!")
                 self.clear_appointment_form()
-                self.refresh_appointments()
-                self.refresh_calendar()
-                self.notebook.select(2)  # Switch to list tab
+                self.invalidate_after_change(previous_date, appointment.appointment_date)
+                self._show_tab('list')
             else:
                 messagebox.showerror("Error", "Failed to save appointment.")
         
@@ -628,7 +808,7 @@ class AppointmentSchedulingFrame:
     def cancel_appointment_edit(self):
         """Cancel editing and return to list"""
         self.clear_appointment_form()
-        self.notebook.select(2)
+        self._show_tab('list')
     
     def edit_appointment(self):
         """Edit selected appointment"""
@@ -643,8 +823,8 @@ class AppointmentSchedulingFrame:
         
         if appointment:
             self.current_appointment = appointment
+            self._show_tab('form')
             self.load_appointment_to_form(appointment)
-            self.notebook.select(1)  # Switch to form tab
         else:
             messagebox.showerror("Error", "Appointment not found.")
     
@@ -698,8 +878,7 @@ class AppointmentSchedulingFrame:
             success = self.data_manager.save_appointment(appointment)
             if success:
                 messagebox.showinfo("Success", "Appointment cancelled successfully!")
-                self.refresh_appointments()
-                self.refresh_calendar()
+                self.invalidate_after_change(appointment.appointment_date)
             else:
                 messagebox.showerror("Error", "Failed to cancel appointment.")
     
@@ -721,56 +900,151 @@ class AppointmentSchedulingFrame:
         success = self.data_manager.save_appointment(appointment)
         if success:
             messagebox.showinfo("Success", "Appointment marked as completed!")
-            self.refresh_appointments()
-            self.refresh_calendar()
+            self.invalidate_after_change(appointment.appointment_date)
         else:
             messagebox.showerror("Error", "Failed to update appointment.")
     
     def refresh_appointments(self):
         """Refresh the appointment list"""
-        # Clear existing items
-        for item in self.appointment_tree.get_children():
-            self.appointment_tree.delete(item)
+        if 'list' not in self._built_tabs:
+            return  # Loaded when the list tab is first shown
         
-        # Load appointments
-        appointments = self.data_manager.get_appointments()
-        
-        # Apply filters
         doctor_filter = self.list_doctor_var.get()
         status_filter = self.list_status_var.get()
         date_filter = self.list_date_var.get()
         
-        for appointment in appointments:
-            # Apply filters
-            if doctor_filter and doctor_filter != 'All' and appointment.doctor_name != doctor_filter:
-                continue
-            
-            if status_filter and status_filter != 'All' and appointment.status != status_filter:
-                continue
-            
-            if date_filter and date_filter not in appointment.appointment_date:
-                continue
-            
-            # Get patient name
-            patient = self.data_manager.get_patient_by_id(appointment.patient_id)
-            patient_name = patient.name if patient else "Unknown Patient"
+        # Read the data manager here on the UI thread; the worker only sees the snapshot
+        try:
+            appointments = self.data_manager.get_appointments(
+                doctor=doctor_filter if doctor_filter != 'All' else None,
+                status=status_filter if status_filter != 'All' else None,
+                date_prefix=date_filter or None
+            )
+            patient_names = self.get_patient_names()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load appointments:\n{str(e)}")
+            return
+        
+        # Truncated notes are reused until the data changes
+        version, notes_previews = self._notes_previews
+        if version != self.data_manager.version:
+            notes_previews = {}
+            self._notes_previews = (self.data_manager.version, notes_previews)
+        
+        self._list_request += 1
+        self._list_requests.put((self._list_request, appointments, patient_names, notes_previews))
+        
+        if 'list_results' not in self._pending_jobs:
+            self._pending_jobs['list_results'] = self.parent.after(50, self._apply_appointment_rows)
+    
+    def _run_list_worker(self):
+        """Build list rows for queued snapshots until the frame is destroyed (worker thread)"""
+        while True:
+            request = self._list_requests.get()
+            if request is None:
+                return
             
-            # Truncate notes for display
-            notes_display = appointment.notes[:30] + "..." if len(appointment.notes) > 30 else appointment.notes
+            # Only the newest waiting snapshot is worth building
+            try:
+                while True:
+                    newer = self._list_requests.get_nowait()
+                    if newer is None:
+                        return
+                    request = newer
+            except queue.Empty:
+                pass
             
-            self.appointment_tree.insert('', 'end', values=(
-                appointment.appointment_id,
-                patient_name,
-                appointment.doctor_name,
-                appointment.department,
-                appointment.appointment_date,
-                appointment.appointment_time,
-                appointment.status,
-                notes_display
-            ))
-    
-    def filter_appointments(self, event=None):
-        """Apply filters to appointment list"""
+            request_id, appointments, patient_names, notes_previews = request
+            try:
+                rows, new_previews = _build_appointment_rows(appointments, patient_names, notes_previews)
+                self._list_results.put((request_id, rows, new_previews, None))
+            except Exception as e:
+                self._list_results.put((request_id, None, None, str(e)))
+    
+    def get_patient_names(self):
+        """Get a {patient_id: name} map, rebuilt only when the patients file changes"""
+        version, names = self._patient_names
+        if version != self.data_manager.patients_version:
+            version = self.data_manager.patients_version
+            names = {p.patient_id: p.name for p in self.data_manager.get_patients()}
+            self._patient_names = (version, names)
+        return names
+    
+    def _apply_appointment_rows(self):
+        """Show the rows of the latest finished list load on the UI thread"""
+        del self._pending_jobs['list_results']
+        result = None
+        try:
+            while True:
+                received = self._list_results.get_nowait()
+                # Results of superseded loads are dropped
+                if received[0] == self._list_request:
+                    result = received
+        except queue.Empty:
+            pass
+        
+        if result is None:
+            # The newest load has not finished yet, check again shortly
+            self._pending_jobs['list_results'] = self.parent.after(50, self._apply_appointment_rows)
+            return
+        
+        _request_id, latest, new_previews, error = result
+        if error is not None:
+            # Keep showing the previous rows
+            messagebox.showerror("Error", f"Failed to load appointments:\n{error}")
+            return
+        
+        # Add the worker's new previews to the memo, replacing the dict it may still be reading
+        version, notes_previews = self._notes_previews
+        if new_previews and version == self.data_manager.version:
+            self._notes_previews = (version, {**notes_previews, **new_previews})
+        
+        # Stop filling in the rows of an older load
+        pending = self._pending_jobs.pop('list_fill', None)
+        if pending is not None:
+            self.parent.after_cancel(pending)
+        
+        # Update the tree in place: only rows that appeared, vanished or changed are touched
+        old_rows = self._tree_rows
+        new_rows = {values[0]: values for values in latest}
+        
+        removed = [iid for iid in old_rows if iid not in new_rows]
+        if removed:
+            self.appointment_tree.delete(*removed)
+            self._tree_rows = {iid: values for iid, values in old_rows.items() if iid in new_rows}
+        
+        # Work from the last row back: inserting at index 0 avoids walking the tree's
+        # sibling list for every 'end' insert, and leaves a fresh list already in order
+        changes = [(iid, values) for iid, values in new_rows.items() if old_rows.get(iid) != values]
+        changes.reverse()
+        self._fill_appointment_rows(changes, tuple(new_rows), 0)
+    
+    def _fill_appointment_rows(self, changes, order, start):
+        """Insert or update one batch of list rows, then yield to the event loop"""
+        self._pending_jobs.pop('list_fill', None)
+        tree = self.appointment_tree
+        shown = self._tree_rows
+        
+        end = start + _LIST_BATCH_SIZE
+        for iid, values in changes[start:end]:
+            if iid in shown:
+                tree.item(iid, values=values)
+            else:
+                tree.insert('', 0, iid=iid, values=values)
+            shown[iid] = values
+        
+        if end < len(changes):
+            self._pending_jobs['list_fill'] = self.parent.after(
+                0, lambda: self._fill_appointment_rows(changes, order, end))
+            return
+        
+        # Restore the load order in one call if inserted rows left it out of order
+        if tree.get_children() != order:
+            tree.set_children('', *order)
+    
+    @debounce()
+    def filter_appointments(self):
+        """Apply filters to appointment list once filter changes pause"""
         self.refresh_appointments()
     
     def clear_filters(self):
@@ -778,72 +1052,115 @@ class AppointmentSchedulingFrame:
         self.list_doctor_var.set('All')
         self.list_status_var.set('All')
         self.list_date_var.set('')
-        self.refresh_appointments()
+        
+        # Shares the pending refresh of any recent filter edit, so the list reloads once
+        self.filter_appointments()
+    
+    def _build_doctor_panels(self):
+        """Create the schedule overview panel for each doctor once"""
+        self._doctor_panels = {}
+        for i, doctor in enumerate(DoctorSchedule.get_doctors()):
+            doctor_frame = ttk.LabelFrame(self.schedule_container, 
+                                        text=f"{doctor['name']} - {doctor['department']}", 
+                                        padding="10")
+            doctor_frame.grid(row=i//2, column=i%2, padx=5, pady=5, sticky='nsew')
+            
+            self._doctor_panels[doctor['name']] = {
+                'frame': doctor_frame,
+                'available': ttk.Label(doctor_frame, foreground='green', justify='left'),
+                'booked': ttk.Label(doctor_frame, foreground='red', justify='left'),
+                'empty': ttk.Label(doctor_frame, text="No schedule available"),
+                'shown': None  # (available text, booked text) last displayed
+            }
+        
+        self._schedule_error_label = ttk.Label(self.schedule_container, 
+                                               text="Invalid date format. Use YYYY-MM-DD")
+        
+        # Configure grid weights
+        self.schedule_container.columnconfigure(0, weight=1)
+        self.schedule_container.columnconfigure(1, weight=1)
     
     def refresh_doctor_schedules(self):
         """Refresh doctor schedule overview"""
-        # Clear existing schedule display
-        for widget in self.schedule_container.winfo_children():
-            widget.destroy()
+        if self._doctor_panels is None:
+            self._build_doctor_panels()
         
         schedule_date = self.schedule_date_var.get()
         
         try:
             # Validate date
-            datetime.strptime(schedule_date, "%Y-%m-%d")
+            parse_ymd(schedule_date)
         except ValueError:
-            ttk.Label(self.schedule_container, text="Invalid date format. Use YYYY-MM-DD").pack()
+            for panel in self._doctor_panels.values():
+                panel['frame'].grid_remove()
+            self._schedule_error_label.grid(row=0, column=0, columnspan=2)
             return
         
-        # Get existing appointments for the date
-        existing_appointments = self.data_manager.get_appointments_by_date(schedule_date)
+        self._schedule_error_label.grid_remove()
         
         # Display schedule for each doctor
         doctors = DoctorSchedule.get_doctors()
+        appointment_index = self.data_manager.get_appointment_index()
+        patient_names = self.get_patient_names()
         
-        for i, doctor in enumerate(doctors):
-            doctor_frame = ttk.LabelFrame(self.schedule_container, 
-                                        text=f"{doctor['name']} - {doctor['department']}", 
-                                        padding="10")
-            doctor_frame.grid(row=i//2, column=i%2, padx=5, pady=5, sticky='nsew')
+        for doctor in doctors:
+            panel = self._doctor_panels[doctor['name']]
+            panel['frame'].grid()
             
             # Get available and booked slots
             available_slots = DoctorSchedule.get_available_slots(
-                doctor['name'], schedule_date, existing_appointments
+                doctor['name'], schedule_date, appointment_index
             )
             
             all_slots = doctor['slots']
-            booked_slots = [slot for slot in all_slots if slot not in available_slots]
+            available_set = set(available_slots)
+            booked_slots = [slot for slot in all_slots if slot not in available_set]
             
-            # Display slots
+            # Booked appointments for this doctor and date, keyed by time slot
+            booked_by_time = {appt.appointment_time: appt for appt in
+                              self.data_manager.get_appointments_by_doctor_date(doctor['name'], schedule_date)
+                              if appt.status in BOOKED_STATUSES}
+            
+            # Build the slot lines
+            available_text = ""
             if available_slots:
-                ttk.Label(doctor_frame, text="Available:", foreground='green').pack(anchor='w')
-                for slot in available_slots:
-                    ttk.Label(doctor_frame, text=f"  • {slot}", foreground='green').pack(anchor='w')
+                available_text = "Available:\n" + "\n".join(f"  • {slot}" for slot in available_slots)
             
+            booked_text = ""
             if booked_slots:
-                ttk.Label(doctor_frame, text="Booked:", foreground='red').pack(anchor='w')
+                booked_lines = ["Booked:"]
                 for slot in booked_slots:
                     # Find the appointment for this slot
-                    appointment = next((appt for appt in existing_appointments 
-                                      if appt.doctor_name == doctor['name'] and appt.appointment_time == slot), None)
+                    appointment = booked_by_time.get(slot)
                     if appointment:
-                        patient = self.data_manager.get_patient_by_id(appointment.patient_id)
-                        patient_name = patient.name if patient else "Unknown"
-                        ttk.Label(doctor_frame, text=f"  • {slot} - {patient_name}", foreground='red').pack(anchor='w')
+                        patient_name = patient_names.get(appointment.patient_id, "Unknown")
+                        booked_lines.append(f"  • {slot} - {patient_name}")
                     else:
-                        ttk.Label(doctor_frame, text=f"  • {slot}", foreground='red').pack(anchor='w')
+                        booked_lines.append(f"  • {slot}")
+                booked_text = "\n".join(booked_lines)
             
-            if not available_slots and not booked_slots:
-                ttk.Label(doctor_frame, text="No schedule available").pack()
-        
-        # Configure grid weights
-        self.schedule_container.columnconfigure(0, weight=1)
-        self.schedule_container.columnconfigure(1, weight=1)
+            # Touch the panel's labels only when its content changed
+            shown = (available_text, booked_text)
+            if panel['shown'] == shown:
+                continue
+            panel['shown'] = shown
+            
+            for key in ('available', 'booked', 'empty'):
+                panel[key].pack_forget()
+            if available_text:
+                panel['available'].config(text=available_text)
+                panel['available'].pack(anchor='w')
+            if booked_text:
+                panel['booked'].config(text=booked_text)
+                panel['booked'].pack(anchor='w')
+            if not available_text and not booked_text:
+                panel['empty'].pack()
     
     def refresh(self):
         """Refresh all appointment data"""
         self.refresh_appointments()
         self.refresh_calendar()
-        self.refresh_patient_list()
-        self.refresh_doctor_schedules()
+        if 'form' in self._built_tabs:
+            self.refresh_patient_list()
+        if 'schedule' in self._built_tabs:
+            self.refresh_doctor_schedules()
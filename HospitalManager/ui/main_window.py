@@ -3,9 +3,10 @@ Main Window - Hospital Management System GUI Main Window
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import sys
 import os
+import queue
 
 # Import UI modules
 from ui.patient_management import PatientManagementFrame
@@ -26,10 +27,16 @@ class MainWindow:
         self.data_manager = data_manager
         self.current_frame = None
         
+        # Announcements can arrive from the service thread, so they are queued
+        # here and only applied to widgets from the Tk main loop
+        self._announcement_queue = queue.Queue()
+        self._last_status_text = None  # Announcement status currently shown in the status bar
+        
         # Initialize announcement system
         self.announcement_system = AnnouncementSystem(
             data_manager, 
-            self.display_announcement
+            self.display_announcement,
+            status_callback=self.refresh_announcement_status
         )
         
         self.setup_window()
@@ -42,6 +49,7 @@ class MainWindow:
         
         # Start announcement system
         self.announcement_system.start_announcement_service()
+        self.root.after(100, self._drain_announcements)
         
         # Bind window close event
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -201,27 +209,43 @@ class MainWindow:
         self.status_label.config(text="Announcement Panel")
     
     def display_announcement(self, message):
-        """Display announcement in the main window"""
-        self.announcement_label.config(text=message)
-        self.root.update_idletasks()
+        """Queue announcement for display in the main window (safe to call from any thread)"""
+        self._announcement_queue.put(message)
+    
+    def _drain_announcements(self):
+        """Show queued announcements on the UI thread"""
+        message = None
+        try:
+            while True:
+                message = self._announcement_queue.get_nowait()
+        except queue.Empty:
+            pass
+        
+        if message is not None:
+            self.announcement_label.config(text=message)
+            
+            # Auto-clear after 30 seconds
+            self.root.after(30000, lambda: self.announcement_label.config(text="No announcements yet..."))
         
-        # Auto-clear after 30 seconds
-        self.root.after(30000, lambda: self.announcement_label.config(text="No announcements yet..."))
+        self.root.after(100, self._drain_announcements)
     
     def update_status(self):
         """Update status bar information"""
         try:
-            # Update announcement system status
-            status = self.announcement_system.get_announcement_status()
-            if status['is_running']:
-                self.announcement_status_label.config(text="Announcements: Active")
-            else:
-                self.announcement_status_label.config(text="Announcements: Inactive")
-            
-            # Schedule next update
-            self.root.after(5000, self.update_status)
+            self.refresh_announcement_status()
         except Exception as e:
             print(f"Error updating status: {e}")
+        
+        # Start and stop are pushed through the status callback, so this is only a fallback poll
+        self.root.after(15000, self.update_status)
+    
+    def refresh_announcement_status(self):
+        """Show the announcement system status, touching the label only when it changed"""
+        status = self.announcement_system.get_announcement_status()
+        text = "Announcements: Active" if status['is_running'] else "Announcements: Inactive"
+        if text != self._last_status_text:
+            self._last_status_text = text
+            self.announcement_status_label.config(text=text)
     
     def create_backup(self):
         """Create data backup"""
@@ -236,8 +260,6 @@ class MainWindow:
     
     def restore_backup(self):
         """Restore data from backup"""
-        from tkinter import filedialog
-        
         try:
             # Get backup files
             backup_files = self.data_manager.get_backup_files()
@@ -698,10 +698,10 @@ class OPDManagementFrame:
         
         # Set vital signs
         if visit.vital_signs:
-            self.bp_var.set(visit.vital_signs.get('blood_pressure', ''))
-            self.temp_var.set(visit.vital_signs.get('temperature', ''))
-            self.pulse_var.set(visit.vital_signs.get('pulse', ''))
-            self.weight_var.set(visit.vital_signs.get('weight', ''))
+            self.bp_var.set(visit.vital_signs.blood_pressure)
+            self.temp_var.set(visit.vital_signs.temperature)
+            self.pulse_var.set(visit.vital_signs.pulse)
+            self.weight_var.set(visit.vital_signs.weight)
         
         # Set text fields
         self.symptoms_text.delete('1.0', tk.END)
@@ -845,14 +845,14 @@ NOTES:
             return "Not recorded"
         
         formatted = []
-        if vital_signs.get('blood_pressure'):
-            formatted.append(f"Blood Pressure: {vital_signs['blood_pressure']}")
-        if vital_signs.get('temperature'):
-            formatted.append(f"Temperature: {vital_signs['temperature']}")
-        if vital_signs.get('pulse'):
-            formatted.append(f"Pulse: {vital_signs['pulse']}")
-        if vital_signs.get('weight'):
-            formatted.append(f"Weight: {vital_signs['weight']}")
+        if vital_signs.blood_pressure:
+            formatted.append(f"Blood Pressure: {vital_signs.blood_pressure}")
+        if vital_signs.temperature:
+            formatted.append(f"Temperature: {vital_signs.temperature}")
+        if vital_signs.pulse:
+            formatted.append(f"Pulse: {vital_signs.pulse}")
+        if vital_signs.weight:
+            formatted.append(f"Weight: {vital_signs.weight}")
         
         return '\n'.join(formatted) if formatted else "Not recorded"
     
@@ -885,12 +885,8 @@ NOTES:
             patient = self.data_manager.get_patient_by_id(visit.patient_id)
             patient_name = patient.name if patient else "Unknown Patient"
             
-            # Format date
-            try:
-                visit_date = datetime.strptime(visit.visit_date, "%Y-%m-%d %H:%M:%S")
-                date_str = visit_date.strftime("%Y-%m-%d")
-            except ValueError:
-                date_str = visit.visit_date
+            # Visit timestamps start with YYYY-MM-DD
+            date_str = visit.visit_date[:10]
             
             # Truncate long text for display
             symptoms_display = visit.symptoms[:50] + "..." if len(visit.symptoms) > 50 else visit.symptoms
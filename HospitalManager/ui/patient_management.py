@@ -241,12 +241,8 @@ class PatientManagementFrame:
         patients = self.data_manager.get_patients()
         
         for patient in patients:
-            # Format registration date
-            try:
-                reg_date = datetime.strptime(patient.registration_date, "%Y-%m-%d %H:%M:%S")
-                formatted_date = reg_date.strftime("%Y-%m-%d")
-            except ValueError:
-                formatted_date = patient.registration_date
+            # Registration timestamps start with YYYY-MM-DD
+            formatted_date = patient.registration_date[:10]
             
             self.patient_tree.insert('', 'end', values=(
                 patient.patient_id,
@@ -520,7 +516,7 @@ class PatientManagementFrame:
         
         # Add visits to tree
         for visit in sorted(opd_visits, key=lambda x: x.visit_date, reverse=True):
-            visit_date = datetime.strptime(visit.visit_date, "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%d")
+            visit_date = visit.visit_date[:10]
             opd_tree.insert('', 'end', values=(
                 visit_date,
                 visit.doctor_name,
@@ -6,6 +6,8 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime, timedelta
 from models.report import ReportGenerator
+from models.appointment import DoctorSchedule
+import csv
 import os
 import threading
 
@@ -166,7 +168,6 @@ class ReportingFrame:
         
         ttk.Label(doctor_frame, text="Doctor Filter:").pack(side='left', padx=(0, 5))
         self.visits_doctor_var = tk.StringVar()
-        from models.appointment import DoctorSchedule
         doctor_options = ['All Doctors'] + [doc['name'] for doc in DoctorSchedule.get_doctors()]
         doctor_combo = ttk.Combobox(doctor_frame, textvariable=self.visits_doctor_var,
                                   values=doctor_options, width=20, state='readonly')
@@ -227,7 +228,6 @@ class ReportingFrame:
         
         ttk.Label(doctor_frame, text="Doctor Filter:").pack(side='left', padx=(0, 5))
         self.appt_doctor_var = tk.StringVar()
-        from models.appointment import DoctorSchedule
         doctor_options = ['All Doctors'] + [doc['name'] for doc in DoctorSchedule.get_doctors()]
         doctor_combo = ttk.Combobox(doctor_frame, textvariable=self.appt_doctor_var,
                                   values=doctor_options, width=20, state='readonly')
@@ -275,7 +275,6 @@ class ReportingFrame:
         
         ttk.Label(doctor_select_frame, text="Select Doctor:").pack(side='left', padx=(0, 5))
         self.doctor_report_var = tk.StringVar()
-        from models.appointment import DoctorSchedule
         doctor_options = [doc['name'] for doc in DoctorSchedule.get_doctors()]
         doctor_combo = ttk.Combobox(doctor_select_frame, textvariable=self.doctor_report_var,
                                   values=doctor_options, width=25, state='readonly')
@@ -453,9 +452,10 @@ class ReportingFrame:
             visits = self.data_manager.get_opd_visits()
             
             # Get today's activities
-            today = datetime.now().strftime("%Y-%m-%d")
+            now = datetime.now()
+            today = now.strftime("%Y-%m-%d")
             today_appointments = [appt for appt in appointments if appt.appointment_date == today]
-            today_visits = [visit for visit in visits if visit.is_today()]
+            today_visits = [visit for visit in visits if visit.is_today(now)]
             
             # Add to activity list
             for appt in today_appointments[:10]:  # Show last 10
@@ -972,7 +972,6 @@ NEW PATIENT REGISTRATIONS
             # Export patients
             patients = self.data_manager.get_patients()
             if patients:
-                import csv
                 patients_file = os.path.join(export_dir, f"patients_{timestamp}.csv")
                 with open(patients_file, 'w', newline='', encoding='utf-8') as f:
                     writer = csv.writer(f)
@@ -1034,8 +1033,6 @@ NEW PATIENT REGISTRATIONS
             if not file_path:
                 return
             
-            import csv
-            
             if data_type == 'patients':
                 patients = self.data_manager.get_patients()
                 with open(file_path, 'w', newline='', encoding='utf-8') as f:
@@ -10,10 +10,12 @@ from datetime import datetime
 class AnnouncementSystem:
     """System for announcing patient names when visits are completed"""
     
-    def __init__(self, data_manager, announcement_callback: Callable = None):
+    def __init__(self, data_manager, announcement_callback: Callable = None,
+                 status_callback: Callable = None):
         """Initialize announcement system"""
         self.data_manager = data_manager
         self.announcement_callback = announcement_callback or self._default_announcement
+        self.status_callback = status_callback  # Called after the service starts or stops
         self.is_running = False
         self.announcement_thread = None
         self.pending_announcements = []
@@ -51,6 +53,7 @@ class AnnouncementSystem:
         self.announcement_thread = threading.Thread(target=self._announcement_loop, daemon=True)
         self.announcement_thread.start()
         print("Announcement service started")
+        self._notify_status()
     
     def stop_announcement_service(self):
         """Stop the announcement service"""
@@ -58,6 +61,15 @@ class AnnouncementSystem:
         if self.announcement_thread and self.announcement_thread.is_alive():
             self.announcement_thread.join(timeout=5)
         print("Announcement service stopped")
+        self._notify_status()
+    
+    def _notify_status(self):
+        """Tell the status listener that the service state changed"""
+        if self.status_callback:
+            try:
+                self.status_callback()
+            except Exception as e:
+                print(f"Error in status callback: {e}")
     
     def _announcement_loop(self):
         """Main announcement loop running in background thread"""
@@ -9,9 +9,27 @@ from datetime import datetime
 from typing import List, Optional, Dict
 
 from models.patient import Patient
-from models.appointment import Appointment
+from models.appointment import Appointment, AppointmentIndex
 from models.opd import OPDVisit, OPDQueue
 
+# Use orjson for faster encoding/decoding if available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(data) -> bytes:
+    """Encode data as indented UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _loads(raw: bytes):
+    """Decode UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 class DataManager:
     """Central data manager for all hospital data operations"""
     
@@ -26,12 +44,33 @@ class DataManager:
         self.opd_visits_file = os.path.join(data_dir, 'opd_visits.json')
         self.settings_file = os.path.join(data_dir, 'settings.json')
         
+        # Files holding patient, appointment and visit records; only these affect derived data
+        self._record_files = frozenset((self.patients_file, self.appointments_file, self.opd_visits_file))
+        
         # Ensure data directory exists
         os.makedirs(data_dir, exist_ok=True)
         
         # Initialize OPD queue
         self.opd_queue = OPDQueue()
         
+        # Booked-slot index, built on first use and kept in sync on save/delete
+        self._appointment_index = None
+        
+        # Appointments bucketed by (doctor_name, appointment_date), built on first use and dropped on write
+        self._appointments_by_doctor_date = None
+        
+        # Parsed file contents keyed by path, reused while the file is unchanged on disk
+        self._file_cache: Dict[str, tuple] = {}
+        
+        # Last (mtime, size) seen for each file, to spot changes made outside this process
+        self._file_signatures: Dict[str, tuple] = {}
+        
+        # Incremented on every change to a record file so consumers can tell when derived data is stale
+        self.version = 0
+        
+        # Incremented only on writes to the patients file, for views that list patients
+        self.patients_version = 0
+        
         # Load initial data
         self._ensure_data_files_exist()
     
@@ -53,8 +92,8 @@ class DataManager:
         for file_path, default_data in default_files.items():
             if not os.path.exists(file_path):
                 try:
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump(default_data, f, indent=2, ensure_ascii=False)
+                    with open(file_path, 'wb') as f:
+                        f.write(_dumps(default_data))
                 except Exception as e:
                     print(f"Error creating {file_path}: {e}")
     
@@ -64,34 +103,90 @@ class DataManager:
             default_value = []
         
         try:
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            stat = os.stat(file_path)
+        except FileNotFoundError:
             return default_value
+        
+        # Skip the parse when the file has not changed since it was last read
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._file_cache.get(file_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        self._note_signature(file_path, signature)
+        
+        try:
+            with open(file_path, 'rb') as f:
+                data = _loads(f.read())
+            self._file_cache[file_path] = (signature, data)
+            return data
         except (json.JSONDecodeError, FileNotFoundError) as e:
             print(f"Error loading {file_path}: {e}")
             return default_value
     
     def _save_json_file(self, file_path: str, data):
         """Save data to JSON file with error handling"""
+        # Callers edit the loaded data in place, so never trust the cached copy after a save
+        self._file_cache.pop(file_path, None)
+        if file_path in self._record_files:
+            self.version += 1
+        if file_path == self.patients_file:
+            self.patients_version += 1
         try:
             # Create backup before saving
             if os.path.exists(file_path):
                 backup_path = f"{file_path}.backup"
                 shutil.copy2(file_path, backup_path)
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(file_path, 'wb') as f:
+                f.write(_dumps(data))
+            self._remember_signature(file_path)
             return True
         except Exception as e:
             print(f"Error saving {file_path}: {e}")
             return False
     
+    def _note_signature(self, file_path: str, signature: tuple):
+        """Record a file's signature, invalidating derived data if it changed outside this process"""
+        # A file that changed without going through _save_json_file was written by another
+        # instance or by hand, so data derived from the old contents is stale
+        known = self._file_signatures.get(file_path)
+        if known is not None and known != signature:
+            self._invalidate_derived(file_path)
+        self._file_signatures[file_path] = signature
+    
+    def check_for_external_changes(self):
+        """Stat the record files and bump the data versions for any changed on disk"""
+        for file_path in self._record_files:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            self._note_signature(file_path, (stat.st_mtime_ns, stat.st_size))
+    
+    def _remember_signature(self, file_path: str):
+        """Record a file's current signature after this process wrote it"""
+        try:
+            stat = os.stat(file_path)
+            self._file_signatures[file_path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            self._file_signatures.pop(file_path, None)
+    
+    def _invalidate_derived(self, file_path: str):
+        """Mark data derived from a file as stale after it changed on disk"""
+        if file_path in self._record_files:
+            self.version += 1
+        if file_path == self.patients_file:
+            self.patients_version += 1
+        elif file_path == self.appointments_file:
+            self._appointment_index = None
+            self._appointments_by_doctor_date = None
+    
     # Patient Management
     def get_patients(self) -> List[Patient]:
         """Get all patients"""
         data = self._load_json_file(self.patients_file)
-        return [Patient.from_dict(patient_data) for patient_data in data]
+        return list(map(Patient.from_dict_fast, data))
     
     def save_patient(self, patient: Patient) -> bool:
         """Save or update a patient"""
@@ -119,6 +214,14 @@ class DataManager:
                 return patient
         return None
     
+    def get_patients_by_ids(self, patient_ids) -> Dict[str, Patient]:
+        """Get the patients with the given IDs, keyed by patient ID"""
+        patient_ids = set(patient_ids)
+        data = self._load_json_file(self.patients_file)
+        # Filter the raw records first so only the requested patients are built
+        return {record['patient_id']: Patient.from_dict_fast(record) for record in data
+                if record.get('patient_id') in patient_ids}
+    
     def delete_patient(self, patient_id: str) -> bool:
         """Delete a patient"""
         patients_data = self._load_json_file(self.patients_file)
@@ -130,9 +233,12 @@ class DataManager:
         patients = self.get_patients()
         results = []
         
+        # Normalize the query once rather than per patient
+        query = query.lower().strip()
+        
         for patient in patients:
             # Text search
-            if not patient.search_matches(query):
+            if query and query not in patient.get_search_text():
                 continue
             
             # Apply filters
@@ -149,26 +255,40 @@ class DataManager:
         return results
     
     # Appointment Management
-    def get_appointments(self) -> List[Appointment]:
-        """Get all appointments"""
+    def get_appointments(self, doctor: Optional[str] = None, status: Optional[str] = None,
+                         date_prefix: Optional[str] = None) -> List[Appointment]:
+        """Get all appointments, optionally only those matching the given filters"""
         data = self._load_json_file(self.appointments_file)
-        return [Appointment.from_dict(appointment_data) for appointment_data in data]
+        
+        # Filter the raw records so rejected rows are never turned into objects
+        if doctor:
+            data = [a for a in data if a.get('doctor_name') == doctor]
+        if status:
+            data = [a for a in data if a.get('status') == status]
+        if date_prefix and len(date_prefix) == 10:
+            data = [a for a in data if a.get('appointment_date') == date_prefix]  # Full date
+        elif date_prefix:
+            data = [a for a in data if a.get('appointment_date', '').startswith(date_prefix)]
+        return list(map(Appointment.from_dict_fast, data))
     
     def save_appointment(self, appointment: Appointment) -> bool:
         """Save or update an appointment"""
         appointments_data = self._load_json_file(self.appointments_file)
+        record = appointment.to_dict()
         
         # Check if appointment already exists
         appointment_exists = False
         for i, existing_appointment in enumerate(appointments_data):
             if existing_appointment.get('appointment_id') == appointment.appointment_id:
-                appointments_data[i] = appointment.to_dict()
+                if existing_appointment == record:
+                    return True  # Nothing changed, so skip rewriting the file
+                appointments_data[i] = record
                 appointment_exists = True
                 break
         
         # Add new appointment if not exists
         if not appointment_exists:
-            appointments_data.append(appointment.to_dict())
+            appointments_data.append(record)
         
         # Update patient's appointment list
         patient = self.get_patient_by_id(appointment.patient_id)
@@ -177,7 +297,11 @@ class DataManager:
                 patient.appointments.append(appointment.appointment_id)
                 self.save_patient(patient)
         
-        return self._save_json_file(self.appointments_file, appointments_data)
+        success = self._save_json_file(self.appointments_file, appointments_data)
+        if success and self._appointment_index is not None:
+            self._appointment_index.add(appointment)
+        self._appointments_by_doctor_date = None
+        return success
     
     def get_appointment_by_id(self, appointment_id: str) -> Optional[Appointment]:
         """Get appointment by ID"""
@@ -191,12 +315,44 @@ class DataManager:
         """Delete an appointment"""
         appointments_data = self._load_json_file(self.appointments_file)
         appointments_data = [a for a in appointments_data if a.get('appointment_id') != appointment_id]
-        return self._save_json_file(self.appointments_file, appointments_data)
+        success = self._save_json_file(self.appointments_file, appointments_data)
+        if success and self._appointment_index is not None:
+            self._appointment_index.remove(appointment_id)
+        self._appointments_by_doctor_date = None
+        return success
+    
+    def get_appointment_index(self) -> AppointmentIndex:
+        """Get the index of booked appointment slots"""
+        self._load_json_file(self.appointments_file)  # Drops the index if the file changed on disk
+        if self._appointment_index is None:
+            self._appointment_index = AppointmentIndex(self.get_appointments())
+        return self._appointment_index
     
     def get_appointments_by_date(self, date: str) -> List[Appointment]:
         """Get appointments for a specific date"""
-        appointments = self.get_appointments()
-        return [appt for appt in appointments if appt.appointment_date == date]
+        return self.get_appointments_in_range(date, date)
+    
+    def get_appointments_in_range(self, start: str, end: str) -> List[Appointment]:
+        """Get appointments dated from start to end inclusive (both 'YYYY-MM-DD')"""
+        data = self._load_json_file(self.appointments_file)
+        # ISO dates order as strings, so the raw records are filtered before any objects are built
+        return [Appointment.from_dict_fast(appt) for appt in data
+                if start <= appt.get('appointment_date', '') <= end]
+    
+    def get_appointments_by_doctor_date(self, doctor_name: str, date: str) -> List[Appointment]:
+        """Get a doctor's appointments on a specific date"""
+        self._load_json_file(self.appointments_file)  # Drops the buckets if the file changed on disk
+        if self._appointments_by_doctor_date is None:
+            buckets: Dict[tuple, List[Appointment]] = {}
+            for appt in self.get_appointments():
+                buckets.setdefault((appt.doctor_name, appt.appointment_date), []).append(appt)
+            self._appointments_by_doctor_date = buckets
+        return list(self._appointments_by_doctor_date.get((doctor_name, date), ()))
+    
+    def get_appointments_by_month(self, year: int, month: int) -> List[Appointment]:
+        """Get appointments whose date falls in the given month"""
+        prefix = f"{year:04d}-{month:02d}-"
+        return self.get_appointments_in_range(prefix + "01", prefix + "31")
     
     def get_appointments_by_doctor(self, doctor_name: str) -> List[Appointment]:
         """Get appointments for a specific doctor"""
@@ -207,7 +363,7 @@ class DataManager:
     def get_opd_visits(self) -> List[OPDVisit]:
         """Get all OPD visits"""
         data = self._load_json_file(self.opd_visits_file)
-        return [OPDVisit.from_dict(visit_data) for visit_data in data]
+        return list(map(OPDVisit.from_dict_fast, data))
     
     def save_opd_visit(self, visit: OPDVisit) -> bool:
         """Save or update an OPD visit"""
@@ -250,12 +406,13 @@ class DataManager:
     def get_todays_opd_visits(self) -> List[OPDVisit]:
         """Get today's OPD visits"""
         visits = self.get_opd_visits()
-        return [visit for visit in visits if visit.is_today()]
+        now = datetime.now()
+        return [visit for visit in visits if visit.is_today(now)]
     
     # Settings Management
     def get_settings(self) -> Dict:
         """Get application settings"""
-        return self._load_json_file(self.settings_file, {})
+        return dict(self._load_json_file(self.settings_file, {}))
     
     def save_settings(self, settings: Dict) -> bool:
         """Save application settings"""
@@ -320,6 +477,10 @@ class DataManager:
             success &= self._save_json_file(self.opd_visits_file, backup_data.get('opd_visits', []))
             success &= self._save_json_file(self.settings_file, backup_data.get('settings', {}))
             
+            # Rebuild derived indexes from the restored data on next use
+            self._appointment_index = None
+            self._appointments_by_doctor_date = None
+            
             return success
         except Exception as e:
             print(f"Error restoring backup: {e}")
@@ -348,14 +509,16 @@ class DataManager:
         appointments = self.get_appointments()
         opd_visits = self.get_opd_visits()
         
-        today = datetime.now().date()
+        now = datetime.now()
+        today_str = now.strftime("%Y-%m-%d")
+        todays_visits = [v for v in opd_visits if v.is_today(now)]
         
         return {
             'total_patients': len(patients),
             'total_appointments': len(appointments),
             'total_opd_visits': len(opd_visits),
-            'todays_appointments': len([a for a in appointments if a.appointment_date == today.strftime("%Y-%m-%d")]),
-            'todays_visits': len([v for v in opd_visits if v.is_today()]),
+            'todays_appointments': len([a for a in appointments if a.appointment_date == today_str]),
+            'todays_visits': len(todays_visits),
             'pending_appointments': len([a for a in appointments if a.status == "Scheduled"]),
-            'completed_visits_today': len([v for v in opd_visits if v.is_today() and v.status == "Completed"])
+            'completed_visits_today': len([v for v in todays_visits if v.status == "Completed"])
         }
@@ -0,0 +1,40 @@
+"""
+Date Utilities - Fast parsing helpers for the fixed date formats stored in the data files
+"""
+
+from datetime import date, datetime
+from functools import lru_cache
+
+# Use the ciso8601 C parser for timestamps if available
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
+@lru_cache(maxsize=4096)
+def parse_ymd(value: str) -> date:
+    """Parse a 'YYYY-MM-DD' string into a date object"""
+    if len(value) != 10 or value[4] != '-' or value[7] != '-':
+        raise ValueError(f"Invalid date '{value}'. Use YYYY-MM-DD")
+    return date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+
+@lru_cache(maxsize=4096)
+def parse_ymd_hm(date_str: str, time_str: str) -> datetime:
+    """Parse a 'YYYY-MM-DD' date and 'HH:MM' time into a datetime object"""
+    if (len(date_str) != 10 or date_str[4] != '-' or date_str[7] != '-' or
+            len(time_str) != 5 or time_str[2] != ':'):
+        raise ValueError(f"Invalid date/time '{date_str} {time_str}'. Use YYYY-MM-DD HH:MM")
+    return datetime(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+                    int(time_str[0:2]), int(time_str[3:5]))
+
+# Timestamps are unique per record, so this cache is sized for whole-dataset report scans
+@lru_cache(maxsize=131072)
+def parse_ymd_hms(value: str) -> datetime:
+    """Parse a 'YYYY-MM-DD HH:MM:SS' string into a datetime object"""
+    if (len(value) != 19 or value[4] != '-' or value[7] != '-' or
+            value[10] != ' ' or value[13] != ':' or value[16] != ':'):
+        raise ValueError(f"Invalid timestamp '{value}'. Use YYYY-MM-DD HH:MM:SS")
+    if ciso8601 is not None:
+        return ciso8601.parse_datetime(value)
+    return datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                    int(value[11:13]), int(value[14:16]), int(value[17:19]))
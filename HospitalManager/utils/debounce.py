@@ -0,0 +1,28 @@
+"""
+Debounce - Coalesce repeated Tk event handler calls into one
+"""
+
+from functools import wraps
+
+def debounce(delay_ms: int = 300):
+    """Run a frame method only once calls to it have stopped for delay_ms
+    
+    Each call cancels the pending one for the same method and arguments. The
+    frame must have a Tk widget in self.parent and a self._pending_jobs dict,
+    which holds the after() ids so they can be cancelled when the frame closes.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args):
+            key = (method.__name__, args)
+            pending = self._pending_jobs.pop(key, None)
+            if pending is not None:
+                self.parent.after_cancel(pending)
+            
+            def run():
+                self._pending_jobs.pop(key, None)
+                method(self, *args)
+            
+            self._pending_jobs[key] = self.parent.after(delay_ms, run)
+        return wrapper
+    return decorator